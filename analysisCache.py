@@ -0,0 +1,165 @@
+# analysisCache.py
+from typing import Iterable, List, Optional
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+DEFAULT_CACHE_MAX_MB = 512
+SHIFTS_FILE = 'possible_shifts.txt'
+
+# Staging directories are named STAGING_PREFIX + pid + random suffix. Ones
+# older than STAGING_MAX_AGE seconds belong to runs that died and are swept.
+STAGING_PREFIX = '.staging-'
+STAGING_MAX_AGE = 3600
+
+# Bumped whenever the stored artifacts change format, so old entries miss.
+_CACHE_VERSION = 1
+
+
+class analysisCache:
+    """
+    Content-addressed store of analysis artifacts (possible shifts, frequency
+    table, plots) under one directory.
+
+    An entry is a directory named after the sha256 of the cleaned input, the
+    alphabet, the decrypt flag and the options. Its mtime is refreshed on
+    every hit, and the least recently used entries are evicted once the
+    cache grows past maxBytes.
+    """
+
+    def __init__(self, root: str, maxBytes: int = DEFAULT_CACHE_MAX_MB * 1024 * 1024):
+        self.root = root
+        self.maxBytes = maxBytes
+        os.makedirs(root, exist_ok=True)
+
+    @staticmethod
+    def key(cleaned: str, alphabet: str, decrypt: bool, options: dict) -> str:
+        digest = hashlib.sha256()
+        header = json.dumps([_CACHE_VERSION, alphabet, decrypt, options], sort_keys=True)
+        digest.update(header.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(cleaned.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def lookup(self, key: str) -> Optional[str]:
+        """
+        Returns the entry directory for key, marking it as recently used, or
+        None on a miss.
+        """
+        path = self._entry(key)
+        if not os.path.isdir(path):
+            return None
+        os.utime(path)
+        return path
+
+    def stage(self) -> str:
+        """
+        Returns a fresh directory to build an entry in; commit() publishes it
+        and discard() drops it.
+        """
+        return tempfile.mkdtemp(prefix=f'{STAGING_PREFIX}{os.getpid()}-', dir=self.root)
+
+    def discard(self, staging: str) -> None:
+        """
+        Removes a staging directory; a no-op once it was committed.
+        """
+        shutil.rmtree(staging, ignore_errors=True)
+
+    def commit(self, key: str, staging: str, artifacts: Iterable[str] = ()) -> str:
+        """
+        Copies the artifacts into a staged entry, publishes it under key and
+        evicts old entries. The staging directory is removed if anything
+        fails, and the error (a missing artifact, a full disk) is raised.
+
+        The rename is atomic, so concurrent runs never see half an entry; if
+        another run published the key first, its entry is kept.
+        """
+        path = self._entry(key)
+        try:
+            for artifact in artifacts:
+                shutil.copyfile(artifact, os.path.join(staging, os.path.basename(artifact)))
+            try:
+                os.rename(staging, path)
+            except OSError:
+                if not os.path.isdir(path):
+                    raise
+        finally:
+            self.discard(staging)
+        self.evict(keep=key)
+        return path
+
+    def restore(self, path: str, names: Iterable[str], target: str) -> List[str]:
+        """
+        Copies the named artifacts of an entry into target.
+        """
+        copied = []
+        for name in names:
+            destination = os.path.join(target, name)
+            shutil.copyfile(os.path.join(path, name), destination)
+            copied.append(destination)
+        return copied
+
+    def invalidate(self, key: str) -> None:
+        shutil.rmtree(self._entry(key), ignore_errors=True)
+
+    def clear(self) -> None:
+        """
+        Removes every entry. Staging directories of runs still in progress are
+        left alone; stale ones are swept.
+        """
+        for name in os.listdir(self.root):
+            if not name.startswith(STAGING_PREFIX):
+                shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+        self.sweepStaging()
+
+    def sweepStaging(self, maxAge: float = STAGING_MAX_AGE) -> int:
+        """
+        Removes staging directories older than maxAge seconds, left behind by
+        runs that were killed. Returns the number removed.
+        """
+        cutoff = time.time() - maxAge
+        removed = 0
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            try:
+                stale = name.startswith(STAGING_PREFIX) and os.stat(path).st_mtime < cutoff
+            except OSError:
+                continue
+            if stale:
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+        return removed
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """
+        Removes least recently used entries until the cache fits maxBytes;
+        the entry named keep is never removed. Stale staging directories are
+        swept as well. Returns the number of entries removed.
+        """
+        self.sweepStaging()
+        entries = []
+        total = 0
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if name.startswith('.') or not os.path.isdir(path):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+            entries.append((os.stat(path).st_mtime, name, size))
+            total += size
+
+        removed = 0
+        for _, name, size in sorted(entries):
+            if total <= self.maxBytes:
+                break
+            if name == keep:
+                continue
+            shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
@@ -0,0 +1,183 @@
+# caesarBatch.py
+from caesarCipher import caesarCipher
+from caesarCipherMain2 import apply_word_cipher, parse_shift_sequence, readTextFile
+from textNormalizer import getNormalizer
+from typing import Iterable, Iterator
+import argparse
+import json
+import sys
+
+ALPHABET = 'abcdefghijklmnopqrstuvwxyz'
+
+# Job fields and their defaults, mirroring the caesarCipherMain2.py flags.
+JOB_DEFAULTS = {
+    'text': None,
+    'textFile': None,
+    'mode': 'encrypt',
+    'shift': 3,
+    'keepNonAlpha': False,
+    'wordCipher': False,
+    'wordShiftMode': 'same',
+    'wordShift': 3,
+    'shiftSequence': None,
+    'seed': 1234,
+}
+
+# Accepted types per job field; None is allowed where the default is None.
+JOB_TYPES = {
+    'text': str,
+    'textFile': str,
+    'mode': str,
+    'shift': int,
+    'keepNonAlpha': bool,
+    'wordCipher': bool,
+    'wordShiftMode': str,
+    'wordShift': int,
+    'shiftSequence': (str, list),
+    'seed': int,
+}
+
+_cipher = caesarCipher()
+_wordCipher = caesarCipher()
+
+
+def getConsoleArguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Run many Caesar cipher jobs (JSONL) in one warm process."
+    )
+
+    parser.add_argument('--jobs', type=str, default=None,
+                        help='JSONL file with one job per line (default: stdin).')
+    parser.add_argument('--output', type=str, default=None,
+                        help='JSONL file for the results (default: stdout).')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes; 1 runs in-process (default: 1).')
+    parser.add_argument('--batchSize', type=int, default=256,
+                        help='Jobs handed to a worker at a time (default: 256).')
+
+    return parser.parse_args()
+
+
+def getCipher(shift: int, preserve_nonalpha: bool) -> caesarCipher:
+    """
+    Returns the process-wide cipher reconfigured for a job; the compiled
+    tables come from the shared state cache, so this is a lookup.
+    """
+    _cipher.setConfig({
+        'shift': shift,
+        'alphabet': ALPHABET,
+        'preserve_nonalpha': preserve_nonalpha
+    })
+    return _cipher
+
+
+def prepareJob(job: dict) -> dict:
+    """
+    Validates a job and fills in the defaults.
+    """
+    unknown = set(job) - set(JOB_DEFAULTS) - {'id'}
+    if unknown:
+        raise ValueError(f"Unknown job field(s): {', '.join(sorted(unknown))}")
+
+    job = {**JOB_DEFAULTS, **job}
+    for field, expected in JOB_TYPES.items():
+        value = job[field]
+        if value is None and JOB_DEFAULTS[field] is None:
+            continue
+        # bool is an int subclass; a flag is not a valid shift or seed.
+        if not isinstance(value, expected) or (expected is int and isinstance(value, bool)):
+            raise ValueError(f"Job field '{field}' has invalid type {type(value).__name__}.")
+    if isinstance(job['shiftSequence'], list) and not all(
+            isinstance(shift, int) and not isinstance(shift, bool) for shift in job['shiftSequence']):
+        raise ValueError("Job field 'shiftSequence' must only contain integers.")
+
+    if job['mode'] not in ('encrypt', 'decrypt'):
+        raise ValueError(f"Unknown mode: {job['mode']}")
+    return job
+
+
+def runJob(job: dict) -> str:
+    """
+    Runs one job the same way caesarCipherMain2.py would and returns the text.
+    """
+    job = prepareJob(job)
+    decrypt = job['mode'] == 'decrypt'
+
+    if job['textFile']:
+        raw_text = readTextFile(job['textFile'])
+    elif job['text'] is not None:
+        raw_text = job['text']
+    else:
+        raise ValueError("Job must include 'text' or 'textFile'.")
+
+    normalizer = getNormalizer(job['keepNonAlpha'])
+
+    if job['wordCipher']:
+        shift_sequence = job['shiftSequence']
+        if isinstance(shift_sequence, str):
+            shift_sequence = parse_shift_sequence(shift_sequence)
+
+        return apply_word_cipher(
+            raw_text=normalizer.normalize(raw_text),
+            cipher_obj=_wordCipher,
+            alphabet=ALPHABET,
+            decrypt=decrypt,
+            word_shift_mode=job['wordShiftMode'],
+            word_shift=job['wordShift'],
+            shift_sequence=shift_sequence,
+            seed=job['seed']
+        )
+
+    return normalizer.transform(getCipher(job['shift'], job['keepNonAlpha']), raw_text, decrypt)
+
+
+def runLine(line: str) -> str:
+    """
+    Parses one JSONL job and returns its JSONL result; errors are reported
+    in the result instead of stopping the batch.
+    """
+    job_id = None
+    try:
+        job = json.loads(line)
+        if not isinstance(job, dict):
+            raise ValueError("Job must be a JSON object.")
+        job_id = job.get('id')
+        result = {'id': job_id, 'result': runJob(job), 'error': None}
+    except Exception as e:
+        # One bad record must not abort the batch (or the pool's imap).
+        result = {'id': job_id, 'result': None, 'error': str(e) or type(e).__name__}
+    return json.dumps(result, ensure_ascii=False)
+
+
+def runBatch(lines: Iterable[str], workers: int = 1, batchSize: int = 256) -> Iterator[str]:
+    """
+    Yields one JSONL result per non-empty job line, in input order.
+    """
+    lines = (line for line in lines if line.strip())
+
+    if workers <= 1:
+        for line in lines:
+            yield runLine(line)
+        return
+
+    from multiprocessing import Pool
+
+    with Pool(processes=workers) as pool:
+        yield from pool.imap(runLine, lines, chunksize=max(batchSize, 1))
+
+
+if __name__ == "__main__":
+    args = getConsoleArguments()
+
+    source = open(args.jobs, 'r', encoding='utf-8') if args.jobs else sys.stdin
+    sink = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+
+    try:
+        for result in runBatch(source, workers=args.workers, batchSize=args.batchSize):
+            sink.write(result)
+            sink.write('\n')
+    finally:
+        if args.jobs:
+            source.close()
+        if args.output:
+            sink.close()
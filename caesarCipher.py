@@ -1,5 +1,143 @@
 # caesarCipher.py
 from cipher import cipher
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Union
+import re
+import threading
+
+BYTES_CHUNK_SIZE = 1 << 24
+
+# Joins records for encrypt_many/decrypt_many; never part of an alphabet
+# that batches run on.
+_RECORD_SEPARATOR = '\0'
+
+DEFAULT_STATE_CACHE_SIZE = 256
+
+
+class compiledState:
+    """
+    Translation tables and validators compiled for one
+    (alphabet, shift, preserve_nonalpha) config.
+    """
+
+    __slots__ = ('encTable', 'decTable', 'invalidChar', 'invalidRecordChar',
+                 'alphabet', 'shift', '_byteTables', 'invalidByte')
+
+    def __init__(self, alphabet: str, shift: int):
+        if len(set(alphabet)) != len(alphabet):
+            raise ValueError("Alphabet must not contain duplicate characters.")
+
+        shifted = alphabet[shift:] + alphabet[:shift]
+        self.alphabet = alphabet
+        self.shift = shift
+        self.encTable = str.maketrans(alphabet, shifted)
+        self.decTable = str.maketrans(shifted, alphabet)
+        self.invalidChar = re.compile('[^' + re.escape(alphabet) + ']')
+        self.invalidRecordChar = re.compile('[^' + re.escape(alphabet + _RECORD_SEPARATOR) + ']')
+        self._byteTables = None
+        self.invalidByte = None
+
+    def byteTables(self) -> tuple:
+        """
+        Builds (once per state) the 256-entry byte tables. ASCII uppercase
+        folds into the lowercase mapping; bytes >= 0x80 pass through, so
+        UTF-8 text outside the alphabet is left intact.
+        """
+        if self._byteTables is None:
+            if not self.alphabet.isascii():
+                raise ValueError("Bytes input requires an ASCII alphabet.")
+
+            enc = bytearray(range(256))
+            dec = bytearray(range(256))
+            for b in range(128):
+                ch = chr(b).lower()
+                enc[b] = ord(ch.translate(self.encTable))
+                dec[b] = ord(ch.translate(self.decTable))
+
+            folded = self.alphabet + ''.join(ch.upper() for ch in self.alphabet if ch.upper() != ch)
+            self.invalidByte = re.compile(b'[^' + re.escape(folded.encode('ascii')) + b']')
+            self._byteTables = (bytes(enc), bytes(dec))
+        return self._byteTables
+
+
+class stateCache:
+    """
+    Process-wide bounded LRU of compiled states keyed by
+    (alphabet, shift, preserve_nonalpha), with hit/miss/eviction counters.
+    """
+
+    def __init__(self, maxSize: int = DEFAULT_STATE_CACHE_SIZE):
+        self._states = OrderedDict()
+        self._lock = threading.Lock()
+        self.maxSize = max(maxSize, 1)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, alphabet: str, shift: int, preserve_nonalpha: bool) -> Optional[compiledState]:
+        key = (alphabet, shift, preserve_nonalpha)
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._states.move_to_end(key)
+            return state
+
+    def put(self, preserve_nonalpha: bool, state: compiledState) -> None:
+        with self._lock:
+            self._states[(state.alphabet, state.shift, preserve_nonalpha)] = state
+            self._evict()
+
+    def resize(self, maxSize: int) -> None:
+        with self._lock:
+            self.maxSize = max(maxSize, 1)
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._states.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> dict:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'size': len(self._states), 'maxSize': self.maxSize}
+
+    def _evict(self) -> None:
+        while len(self._states) > self.maxSize:
+            self._states.popitem(last=False)
+            self.evictions += 1
+
+
+STATE_CACHE = stateCache()
+
+
+def stateCacheInfo() -> dict:
+    """
+    Returns the hit/miss/eviction counters and the current/maximum size.
+    """
+    return STATE_CACHE.info()
+
+
+def setStateCacheSize(maxSize: int) -> None:
+    """
+    Bounds the compiled-state cache, evicting least recently used states.
+    """
+    STATE_CACHE.resize(maxSize)
+
+
+def getCompiledState(alphabet: str, shift: int, preserve_nonalpha: bool = True) -> compiledState:
+    """
+    Returns the cached state for a config, compiling (and validating the
+    alphabet) on a miss. shift must already be reduced modulo len(alphabet).
+    """
+    state = STATE_CACHE.get(alphabet, shift, preserve_nonalpha)
+    if state is None:
+        state = compiledState(alphabet, shift)
+        STATE_CACHE.put(preserve_nonalpha, state)
+    return state
 
 
 class caesarCipher(cipher):
@@ -18,6 +156,7 @@ class caesarCipher(cipher):
             'alphabet': 'abcdefghijklmnopqrstuvwxyz',
             'preserve_nonalpha': True
         }
+        self._state = getCompiledState('abcdefghijklmnopqrstuvwxyz', 1)
 
     def setConfig(self, newConf) -> None:
         """
@@ -39,66 +178,168 @@ class caesarCipher(cipher):
         if not isinstance(alphabet, str) or len(alphabet) == 0:
             raise ValueError("Alphabet must be a non-empty string.")
 
-        if len(set(alphabet)) != len(alphabet):
-            raise ValueError("Alphabet must not contain duplicate characters.")
-
         if not isinstance(preserve_nonalpha, bool):
             raise ValueError("'preserve_nonalpha' must be a boolean.")
 
         shift = shift % len(alphabet)
 
+        # A cached state has already passed the duplicate-letter check, so
+        # reconfiguring is a single lookup.
+        state = getCompiledState(alphabet, shift, preserve_nonalpha)
+
         self._conf = {
             'shift': shift,
             'alphabet': alphabet,
             'preserve_nonalpha': preserve_nonalpha
         }
+        self._state = state
+
+    def getConfig(self) -> dict:
+        """
+        Returns a copy of the current (validated) configuration.
+        """
+        return dict(self._conf)
 
     def encrypt(self, text: str) -> str:
         """
         Encrypts text using the configured Caesar shift.
         """
-        alphabet = self._conf['alphabet']
-        alphabet_size = len(alphabet)
-        shift = self._conf['shift']
-        preserve_nonalpha = self._conf['preserve_nonalpha']
+        return self.transform(text.lower().strip())
 
-        result = ""
-        text = text.lower().strip()
+    def decrypt(self, ciphertext: str) -> str:
+        """
+        Decrypts text using the configured Caesar shift.
+        """
+        return self.transform(ciphertext.lower().strip(), decrypt=True)
+
+    def transform(self, text: str, decrypt: bool = False) -> str:
+        """
+        Applies the configured mapping without lowercasing or stripping.
 
-        for char in text:
-            if char in alphabet:
-                index = alphabet.index(char)
-                new_index = (index + shift) % alphabet_size
-                result += alphabet[new_index]
-            else:
-                if preserve_nonalpha:
-                    result += char
-                else:
-                    raise ValueError(f"Character '{char}' not in alphabet.")
+        Used by callers that normalize the input themselves, e.g. when the
+        text arrives in chunks.
+        """
+        self._checkAlphabet(text)
+        return text.translate(self._state.decTable if decrypt else self._state.encTable)
 
-        return result
+    def encrypt_many(self, texts: Iterable[str]) -> List[Union[str, ValueError]]:
+        """
+        Encrypts many short records in one translate call.
 
-    def decrypt(self, ciphertext: str) -> str:
+        Matches [encrypt(t) for t in texts], except that a record rejected by
+        'preserve_nonalpha' comes back as its ValueError.
         """
-        Decrypts text using the configured Caesar shift.
+        return self._transformMany(texts, decrypt=False)
+
+    def decrypt_many(self, texts: Iterable[str]) -> List[Union[str, ValueError]]:
+        """
+        Decrypts many short records in one translate call.
+        """
+        return self._transformMany(texts, decrypt=True)
+
+    def _transformMany(self, texts: Iterable[str], decrypt: bool) -> list:
+        # Whitespace has no case mapping, so stripping before lower() gives
+        # the same records as encrypt()'s lower().strip().
+        records = [text.strip() for text in texts]
+        if not records:
+            return []
+
+        joined = _RECORD_SEPARATOR.join(records).lower()
+        if _RECORD_SEPARATOR in self._conf['alphabet'] or joined.count(_RECORD_SEPARATOR) != len(records) - 1:
+            return super()._many(lambda text: self.transform(text.lower(), decrypt), records)
+
+        if not self._conf['preserve_nonalpha'] and self._state.invalidRecordChar.search(joined):
+            return super()._many(lambda text: self.transform(text, decrypt), joined.split(_RECORD_SEPARATOR))
+
+        return joined.translate(self._state.decTable if decrypt else self._state.encTable).split(_RECORD_SEPARATOR)
+
+    def encrypt_bytes(self, data) -> bytes:
+        """
+        Encrypts ASCII/UTF-8 bytes with a 256-entry table, without decoding.
+
+        ASCII letters are lowercased like encrypt() does, but nothing is
+        stripped so the output keeps the input length.
+        """
+        return self._translateBytes(data, self._state.byteTables()[0])
+
+    def decrypt_bytes(self, data) -> bytes:
+        """
+        Decrypts ASCII/UTF-8 bytes with a 256-entry table, without decoding.
+        """
+        return self._translateBytes(data, self._state.byteTables()[1])
+
+    def encrypt_inplace(self, buffer, chunkSize: int = BYTES_CHUNK_SIZE) -> None:
+        """
+        Encrypts a writable buffer (bytearray, mmap, ...) in place, one chunk
+        at a time.
+        """
+        self.encrypt_into(buffer, buffer, chunkSize)
+
+    def decrypt_inplace(self, buffer, chunkSize: int = BYTES_CHUNK_SIZE) -> None:
+        """
+        Decrypts a writable buffer (bytearray, mmap, ...) in place, one chunk
+        at a time.
+        """
+        self.decrypt_into(buffer, buffer, chunkSize)
+
+    def encrypt_into(self, source, target, chunkSize: int = BYTES_CHUNK_SIZE) -> None:
+        """
+        Encrypts a buffer into a preallocated writable buffer of the same
+        length, e.g. an mmap of the output file.
+        """
+        self._translateInto(source, target, self._state.byteTables()[0], chunkSize)
+
+    def decrypt_into(self, source, target, chunkSize: int = BYTES_CHUNK_SIZE) -> None:
+        """
+        Decrypts a buffer into a preallocated writable buffer of the same
+        length.
+        """
+        self._translateInto(source, target, self._state.byteTables()[1], chunkSize)
+
+    def _translateBytes(self, data, table: bytes) -> bytes:
+        if not isinstance(data, (bytes, bytearray)):
+            data = bytes(data)
+        self._checkBytes(data)
+        return bytes(data.translate(table))
+
+    def _translateInto(self, source, target, table: bytes, chunkSize: int) -> None:
+        if len(source) != len(target):
+            raise ValueError("Source and target buffers must have the same length.")
+
+        chunkSize = max(chunkSize, 1)
+        bounds = [(start, min(start + chunkSize, len(source))) for start in range(0, len(source), chunkSize)]
+
+        # Validate everything first so a rejected input never leaves the
+        # target half-written.
+        if not self._conf['preserve_nonalpha']:
+            for start, stop in bounds:
+                self._checkBytes(bytes(source[start:stop]))
+
+        for start, stop in bounds:
+            chunk = source[start:stop]
+            if not isinstance(chunk, (bytes, bytearray)):
+                chunk = bytes(chunk)
+            target[start:stop] = chunk.translate(table)
+
+    def _checkBytes(self, data) -> None:
         """
-        alphabet = self._conf['alphabet']
-        alphabet_size = len(alphabet)
-        shift = self._conf['shift']
-        preserve_nonalpha = self._conf['preserve_nonalpha']
-
-        result = ""
-        ciphertext = ciphertext.lower().strip()
-
-        for char in ciphertext:
-            if char in alphabet:
-                index = alphabet.index(char)
-                new_index = (index - shift) % alphabet_size
-                result += alphabet[new_index]
-            else:
-                if preserve_nonalpha:
-                    result += char
-                else:
-                    raise ValueError(f"Character '{char}' not in alphabet.")
-
-        return result
\ No newline at end of file
+        Byte counterpart of _checkAlphabet.
+        """
+        if self._conf['preserve_nonalpha']:
+            return
+
+        match = self._state.invalidByte.search(data)
+        if match:
+            raise ValueError(f"Byte {match.group()!r} not in alphabet.")
+
+    def _checkAlphabet(self, text: str) -> None:
+        """
+        Raises on the first character outside the alphabet when
+        'preserve_nonalpha' is disabled.
+        """
+        if self._conf['preserve_nonalpha']:
+            return
+
+        match = self._state.invalidChar.search(text)
+        if match:
+            raise ValueError(f"Character '{match.group()}' not in alphabet.")
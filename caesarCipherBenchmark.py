@@ -0,0 +1,404 @@
+# caesarCipherBenchmark.py
+from caesarCipher import caesarCipher
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import List, Optional
+
+HEAVY_MODULES = ('numpy', 'pandas', 'matplotlib')
+
+DEFAULT_SUITE_SIZES = '1KB,1MB,16MB'
+DEFAULT_TOLERANCE = 0.2
+# Suite results the --suite run is compared against unless --noBaseline is
+# given; refresh it with --output after an intended change.
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarkBaseline.json')
+SIZE_UNITS = {'KB': 1 << 10, 'MB': 1 << 20, 'GB': 1 << 30}
+
+# Corpora larger than this are tiled from one generated block of this size.
+_CORPUS_BLOCK = 1 << 20
+
+
+def getConsoleArguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the compiled Caesar cipher against the original per-character loop, "
+                    "or run the stage benchmark suite with --suite."
+    )
+
+    parser.add_argument('--size', type=int, default=1_000_000,
+                        help='Size of the generated corpus in characters (default: 1000000).')
+    parser.add_argument('--shift', type=int, default=3,
+                        help='Shift value used for the benchmark (default: 3).')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Number of timed runs; the best one is reported (default: 3).')
+    parser.add_argument('--seed', type=int, default=1234,
+                        help='Seed for the generated corpus (default: 1234).')
+
+    parser.add_argument('--startup', action='store_true',
+                        help='Benchmark CLI start-up time of a plain encryption instead.')
+    parser.add_argument('--startupRuns', type=int, default=10,
+                        help='Number of CLI invocations for --startup (default: 10).')
+    parser.add_argument('--maxStartupMs', type=float, default=150.0,
+                        help='Fail --startup when the median run exceeds this many ms (default: 150).')
+
+    parser.add_argument('--suite', action='store_true',
+                        help='Run the benchmark suite (throughput and peak memory of every pipeline stage).')
+    parser.add_argument('--sizes', type=str, default=DEFAULT_SUITE_SIZES,
+                        help=f'Comma-separated corpus sizes for --suite, 1KB to 1GB (default: {DEFAULT_SUITE_SIZES}).')
+    parser.add_argument('--cases', type=str, default=None,
+                        help='Comma-separated subset of suite cases to run (default: all).')
+    parser.add_argument('--output', type=str, default=None,
+                        help='Write the suite results as JSON to this file.')
+    parser.add_argument('--baseline', type=str, default=DEFAULT_BASELINE,
+                        help='Compare the suite results against this JSON file and fail on regressions '
+                             '(default: the committed benchmarkBaseline.json).')
+    parser.add_argument('--noBaseline', action='store_true',
+                        help='Do not compare the suite results against a baseline.')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'Allowed relative regression against --baseline (default: {DEFAULT_TOLERANCE}).')
+
+    return parser.parse_args()
+
+
+def generateCorpus(size: int, seed: int = 1234) -> str:
+    """
+    Generates lowercase words separated by spaces and some punctuation.
+    """
+    rng = random.Random(seed)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    parts = []
+    length = 0
+    while length < size:
+        word = ''.join(rng.choice(letters) for _ in range(rng.randint(1, 10)))
+        sep = rng.choice([' ', ' ', ' ', ', ', '. ', '\n'])
+        parts.append(word + sep)
+        length += len(word) + len(sep)
+    return ''.join(parts)[:size]
+
+
+def parseSize(value: str) -> int:
+    """
+    Parses sizes such as '1KB', '16MB', '1GB' or a plain number of characters.
+    """
+    value = value.strip().upper()
+    for unit, factor in SIZE_UNITS.items():
+        if value.endswith(unit):
+            return int(float(value[:-len(unit)]) * factor)
+    return int(value)
+
+
+def formatSize(size: int) -> str:
+    for unit, factor in reversed(SIZE_UNITS.items()):
+        if size >= factor and size % factor == 0:
+            return f"{size // factor}{unit}"
+    return str(size)
+
+
+def corpusOfSize(size: int, seed: int = 1234) -> str:
+    """
+    Generates a corpus of exactly size characters; large ones repeat one
+    generated block so that a 1 GB corpus takes seconds, not minutes.
+    """
+    if size <= _CORPUS_BLOCK:
+        return generateCorpus(size, seed)
+    block = generateCorpus(_CORPUS_BLOCK, seed)
+    return (block * (size // len(block) + 1))[:size]
+
+
+def legacyEncrypt(text: str, shift: int, alphabet: str) -> str:
+    """
+    Original per-character implementation, kept as the reference point.
+    """
+    alphabet_size = len(alphabet)
+    result = ""
+    text = text.lower().strip()
+
+    for char in text:
+        if char in alphabet:
+            index = alphabet.index(char)
+            new_index = (index + shift) % alphabet_size
+            result += alphabet[new_index]
+        else:
+            result += char
+
+    return result
+
+
+def bestOf(repeat: int, func, *args) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def plainEncryptCommand(script: str = 'caesarCipherMain2.py') -> list:
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), script)
+    command = [sys.executable, path, '--text', 'hello world', '--shift', '3']
+    if script == 'caesarCipherMain2.py':
+        command += ['--noWizard', '--keepNonAlpha']
+    return command
+
+
+def heavyImports(command: list) -> list:
+    """
+    Returns the heavy modules a command imports, according to -X importtime.
+    """
+    result = subprocess.run([command[0], '-X', 'importtime'] + command[1:],
+                            capture_output=True, text=True, check=True)
+    imported = {line.rsplit('|', 1)[-1].strip().split('.')[0] for line in result.stderr.splitlines()}
+    return sorted(imported.intersection(HEAVY_MODULES))
+
+
+def startupTimes(command: list, runs: int) -> list:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, capture_output=True, check=True)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def runStartupBenchmark(runs: int, maxStartupMs: float) -> int:
+    """
+    Times plain --text/--shift invocations of both entry scripts and fails if
+    one pulls in a heavy module or its median exceeds maxStartupMs.
+    """
+    failed = False
+    for script in ('caesarCipherMain.py', 'caesarCipherMain2.py'):
+        command = plainEncryptCommand(script)
+
+        heavy = heavyImports(command)
+        if heavy:
+            print(f"{script}: plain encryption imports {', '.join(heavy)}")
+            failed = True
+
+        median = statistics.median(startupTimes(command, runs)) * 1000
+        print(f"{script}: median start-up {median:.1f} ms over {runs} runs (limit {maxStartupMs:.0f} ms)")
+        if median > maxStartupMs:
+            failed = True
+
+    return 1 if failed else 0
+
+
+def suiteCases(alphabet: str, shift: int, workdir: str) -> dict:
+    """
+    Returns case name -> function(corpus) covering the stages of
+    caesarCipherMain2.py; the heavy modules are imported on first use.
+    """
+    from caesarCipherMain2 import apply_word_cipher, cleanText_for_analysis
+    from wordCipher import WORD_SHIFT_MODES
+
+    cipher = caesarCipher()
+    config = {'shift': shift, 'alphabet': alphabet, 'preserve_nonalpha': True}
+
+    def encrypt(corpus):
+        cipher.setConfig(config)
+        cipher.encrypt(corpus)
+
+    def decrypt(corpus):
+        cipher.setConfig(config)
+        cipher.decrypt(corpus)
+
+    def wordMode(mode):
+        def run(corpus):
+            apply_word_cipher(corpus, cipher, alphabet, False, mode, shift, [1, 5, 13, 2], 1234)
+        return run
+
+    def possibleShifts(cleaned):
+        for candidate in range(1, len(alphabet)):
+            cipher.setConfig({'shift': candidate, 'alphabet': alphabet, 'preserve_nonalpha': True})
+            cipher.encrypt(cleaned)
+
+    def analysis(corpus):
+        # The analysis path of caesarCipherMain2.py as it runs today ('clean',
+        # 'table' and 'shifts' stages), without printing or writing files.
+        from frequencyTable import buildFrequencyTable
+
+        cleaned = cleanText_for_analysis(corpus)
+        buildFrequencyTable(cleaned, alphabet)
+        possibleShifts(cleaned)
+
+    def shiftsOnly(corpus):
+        # Only the 25 possible-shifts passes, one full encryption per shift.
+        possibleShifts(cleanText_for_analysis(corpus))
+
+    def frequencyTable(corpus):
+        from frequencyTable import buildFrequencyTable
+
+        table = buildFrequencyTable(cleanText_for_analysis(corpus), alphabet)
+        table.to_csv(os.path.join(workdir, 'frequency_table.csv'), index=True)
+
+    def plots(corpus):
+        from frequencyPlots import renderShiftPlots
+        from frequencyTable import shiftFrequencyMatrix
+
+        shifts = list(range(1, len(alphabet)))
+        rows = shiftFrequencyMatrix(cleanText_for_analysis(corpus), alphabet, shifts).tolist()
+        renderShiftPlots(rows, shifts, alphabet, workdir, workers=1)
+
+    cases = {'encrypt': encrypt, 'decrypt': decrypt}
+    cases.update((f'word-{mode}', wordMode(mode)) for mode in WORD_SHIFT_MODES)
+    cases.update({'analysis': analysis, 'analysis-shifts': shiftsOnly, 'frequencyTable': frequencyTable,
+                  'plots': plots})
+    return cases
+
+
+def peakMemory(func, *args) -> int:
+    """
+    Peak bytes allocated by one call, from tracemalloc.
+    """
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def runSuite(sizes: list, repeat: int, shift: int, seed: int, startupRuns: int,
+             cases: Optional[list] = None, progress=None) -> dict:
+    """
+    Measures MB/s (best of repeat) and tracemalloc peak for every case and
+    corpus size, plus the median start-up time of both entry scripts.
+
+    Results are keyed 'case@size' (and 'startup@script'); each holds
+    'mbPerSec' and 'peakBytes', or 'startupMs'.
+    """
+    alphabet = 'abcdefghijklmnopqrstuvwxyz'
+    results = {}
+
+    with tempfile.TemporaryDirectory() as workdir:
+        available = suiteCases(alphabet, shift, workdir)
+        unknown = set(cases or ()) - set(available) - {'startup'}
+        if unknown:
+            raise ValueError(f"Unknown benchmark case(s): {', '.join(sorted(unknown))}.")
+
+        for size in sizes:
+            corpus = corpusOfSize(size, seed)
+            megabytes = len(corpus) / 1e6
+            for name, func in available.items():
+                if cases and name not in cases:
+                    continue
+                elapsed = bestOf(repeat, func, corpus)
+                key = f"{name}@{formatSize(size)}"
+                results[key] = {
+                    'mbPerSec': megabytes / elapsed if elapsed > 0 else float('inf'),
+                    'peakBytes': peakMemory(func, corpus),
+                }
+                if progress:
+                    progress(key, results[key])
+            del corpus
+
+    if not cases or 'startup' in cases:
+        for script in ('caesarCipherMain.py', 'caesarCipherMain2.py'):
+            key = f"startup@{script}"
+            results[key] = {'startupMs': statistics.median(startupTimes(plainEncryptCommand(script), startupRuns)) * 1000}
+            if progress:
+                progress(key, results[key])
+
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def compareResults(current: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    Lists the metrics that regressed by more than tolerance: lower MB/s, or
+    higher peak memory or start-up time. Metrics missing on either side are
+    not compared.
+    """
+    regressions = []
+    for key, metrics in current['results'].items():
+        reference = baseline.get('results', {}).get(key)
+        if not reference:
+            continue
+        for metric, value in metrics.items():
+            before = reference.get(metric)
+            if before is None or before <= 0:
+                continue
+            if metric == 'mbPerSec':
+                worse = value < before * (1 - tolerance)
+            else:
+                worse = value > before * (1 + tolerance)
+            if worse:
+                regressions.append(f"{key} {metric}: {before:,.2f} -> {value:,.2f}")
+    return regressions
+
+
+def reportCase(key: str, metrics: dict) -> None:
+    if 'startupMs' in metrics:
+        print(f"{key:<28} {metrics['startupMs']:10.1f} ms")
+    else:
+        print(f"{key:<28} {metrics['mbPerSec']:10.2f} MB/s {metrics['peakBytes'] / 1e6:10.2f} MB peak")
+
+
+def runSuiteCommand(args: argparse.Namespace) -> int:
+    sizes = [parseSize(size) for size in args.sizes.split(',') if size.strip()]
+    cases = [case.strip() for case in args.cases.split(',')] if args.cases else None
+    try:
+        current = runSuite(sizes, args.repeat, args.shift, args.seed, args.startupRuns, cases, reportCase)
+    except ValueError as e:
+        raise SystemExit(str(e))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+
+    if args.noBaseline or not args.baseline:
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if (baseline.get('python'), baseline.get('machine')) != (current['python'], current['machine']):
+        print(f"Note: {args.baseline} was recorded with Python {baseline.get('python')} on "
+              f"{baseline.get('machine')}; throughput may not be comparable.")
+    regressions = compareResults(current, baseline, args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    print(f"{len(regressions)} regression(s) against {args.baseline} (tolerance {args.tolerance:.0%}).")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    args = getConsoleArguments()
+
+    if args.startup:
+        raise SystemExit(runStartupBenchmark(args.startupRuns, args.maxStartupMs))
+
+    if args.suite:
+        raise SystemExit(runSuiteCommand(args))
+
+    alphabet = 'abcdefghijklmnopqrstuvwxyz'
+    corpus = generateCorpus(args.size, args.seed)
+
+    cipher = caesarCipher()
+    cipher.setConfig({
+        'shift': args.shift,
+        'alphabet': alphabet,
+        'preserve_nonalpha': True
+    })
+
+    if cipher.encrypt(corpus) != legacyEncrypt(corpus, args.shift % len(alphabet), alphabet):
+        raise SystemExit("Compiled cipher output differs from the legacy loop.")
+
+    legacy = bestOf(args.repeat, legacyEncrypt, corpus, args.shift % len(alphabet), alphabet)
+    compiled = bestOf(args.repeat, cipher.encrypt, corpus)
+    megabytes = len(corpus) / 1e6
+
+    print(f"Corpus: {len(corpus)} chars")
+    print(f"Legacy loop:     {legacy:.4f}s ({megabytes / legacy:.2f} MB/s)")
+    print(f"Compiled tables: {compiled:.4f}s ({megabytes / compiled:.2f} MB/s)")
+    print(f"Speedup: {legacy / compiled:.1f}x")
@@ -1,12 +1,10 @@
 # caesarCipherMain.py
 from caesarCipher import caesarCipher
-import matplotlib.ticker as mticker
-from collections import Counter
-import matplotlib.pyplot as plt
+from cipherStream import DEFAULT_CHUNK_SIZE, openTextSink, openTextSource, streamTransform
+from textNormalizer import CLEAN_TEXT
 from utils import checkPath
-import pandas as pd
 import argparse
-import re
+import io
 import os
 
 
@@ -27,6 +25,10 @@ def getConsoleArguments() -> argparse.Namespace:
                         help='Save the frequency table to a CSV file.')
     parser.add_argument('--savePlots', action='store_true',
                         help='Save frequency plots for each shift.')
+    parser.add_argument('--plotWorkers', type=int, default=None,
+                        help='Processes used to render --savePlots (default: one per CPU).')
+    parser.add_argument('--plotGrid', action='store_true',
+                        help='With --savePlots, also save all shifts in one small-multiples image.')
     parser.add_argument('--savePossibleShifts', action='store_true',
                         help='Save all possible shifts to a txt file.')
     parser.add_argument('--resultsPath', type=str,
@@ -36,33 +38,21 @@ def getConsoleArguments() -> argparse.Namespace:
                         help='Decrypt the text instead of encrypting it.')
     parser.add_argument('--countChars', action='store_true',
                         help='Print non-whitespace character count from the raw input (before cleaning).')
+    parser.add_argument('--stream', action='store_true',
+                        help='Encrypt/decrypt in fixed-size chunks with flat memory; reads stdin when no input is given.')
+    parser.add_argument('--outFile', type=str, default=None,
+                        help='Output file for --stream (default: stdout).')
+    parser.add_argument('--chunkSize', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f'Characters per chunk for --stream (default: {DEFAULT_CHUNK_SIZE}).')
 
     return parser.parse_args()
 
 
-def createPlot(frequency, shift, alphabet, resultsPath):
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.bar(list(alphabet), frequency.values)
-    ax.set_title(f'Frequency Analysis for Shift {shift}')
-    ax.set_xlabel('Letters')
-    ax.set_ylabel('Frequency')
-    ax.yaxis.set_major_locator(mticker.MaxNLocator(integer=True))
-    plt.tight_layout()
-
-    plot_filename = os.path.join(resultsPath, f'frequency_shift_{shift}.png')
-    plt.savefig(plot_filename)
-    plt.close(fig)
-
-
 def cleanText(text) -> str:
     """
     Cleans the input text for analysis mode.
     """
-    text = text.strip().lower()
-    text = text.replace('\n', ' ').replace('\r', ' ')
-    text = re.sub(r'\s{2,}', ' ', text)
-    text = re.sub(r'[^a-z\s]', '', text)
-    return text
+    return CLEAN_TEXT.normalize(text)
 
 
 def readTextFile(path: str) -> str:
@@ -79,6 +69,28 @@ def countNonWhitespaceChars(raw_text: str) -> int:
 if __name__ == "__main__":
     args = getConsoleArguments()
 
+    if args.stream:
+        if args.saveFrecuencyTable or args.savePlots or args.savePossibleShifts:
+            raise SystemExit("--stream only supports plain encryption/decryption.")
+
+        cipher = caesarCipher()
+        cipher.setConfig({
+            'shift': args.shift,
+            'alphabet': 'abcdefghijklmnopqrstuvwxyz',
+            'preserve_nonalpha': True
+        })
+
+        source = io.StringIO(args.text) if args.text and not args.textFile else openTextSource(args.textFile)
+        sink = openTextSink(args.outFile)
+        try:
+            streamTransform(source, sink, cipher, decrypt=args.decrypt,
+                            keepNonAlpha=False, chunkSize=args.chunkSize)
+        finally:
+            source.close()
+            if args.outFile:
+                sink.close()
+        raise SystemExit(0)
+
     if args.textFile:
         raw_text = readTextFile(args.textFile)
     elif args.text:
@@ -89,8 +101,6 @@ if __name__ == "__main__":
     if args.countChars:
         print(f"Non-whitespace character count: {countNonWhitespaceChars(raw_text)}")
 
-    text = cleanText(raw_text)
-
     cipher = caesarCipher()
     alphabet = 'abcdefghijklmnopqrstuvwxyz'
 
@@ -100,14 +110,18 @@ if __name__ == "__main__":
             'alphabet': alphabet,
             'preserve_nonalpha': True
         })
-        modifiedText = cipher.encrypt(text) if not args.decrypt else cipher.decrypt(text)
+        modifiedText = CLEAN_TEXT.transform(cipher, raw_text, decrypt=args.decrypt)
         print(f"{'Decrypted' if args.decrypt else 'Encrypted'} text: {modifiedText}")
         raise SystemExit(0)
 
+    text = cleanText(raw_text)
+
     checkPath(os.path.abspath(args.resultsPath))
 
-    frequencyTable = pd.DataFrame(columns=list(alphabet))
-    shiftLabels = []
+    # numpy/pandas are only needed from here on; plain encrypt/decrypt never loads them.
+    from frequencyTable import buildFrequencyTable
+
+    frequencyTable = buildFrequencyTable(text, alphabet, decrypt=args.decrypt)
 
     shiftsFilename = os.path.join(args.resultsPath, 'possible_shifts.txt')
     possible_shifts_file = None
@@ -125,28 +139,24 @@ if __name__ == "__main__":
 
         newText = cipher.encrypt(text) if not args.decrypt else cipher.decrypt(text)
 
-        frequency = Counter(ch for ch in newText if ch in alphabet)
-
-        newRowSeries = pd.Series(0, index=list(alphabet))
-        newRowSeries.update(pd.Series(frequency))
-
-        newRow = pd.DataFrame([newRowSeries])
-        frequencyTable = pd.concat([frequencyTable, newRow], ignore_index=True)
-
-        shiftLabels.append(f'Shift {shift}')
         print(f"Shift {shift}: {newText}")
 
-        if args.savePlots:
-            createPlot(newRowSeries, shift, alphabet, args.resultsPath)
-
         if args.savePossibleShifts and possible_shifts_file:
             possible_shifts_file.write(f"Shift {shift}: {newText}\n")
 
     if possible_shifts_file:
         possible_shifts_file.close()
 
+    if args.savePlots:
+        from frequencyPlots import renderShiftPlots, renderSmallMultiples
+
+        rows = frequencyTable.to_numpy().tolist()
+        shifts = list(range(1, len(alphabet)))
+        renderShiftPlots(rows, shifts, alphabet, args.resultsPath, workers=args.plotWorkers)
+        if args.plotGrid:
+            renderSmallMultiples(rows, shifts, alphabet, args.resultsPath)
+
     if args.saveFrecuencyTable:
-        frequencyTable.index = shiftLabels
         table_filename = os.path.join(args.resultsPath, 'frequency_table.csv')
         frequencyTable.to_csv(table_filename, index=True)
         print(f"Frequency table saved to '{table_filename}'.")
\ No newline at end of file
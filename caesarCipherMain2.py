@@ -1,15 +1,25 @@
 # caesarCipherMain2.py
 from caesarCipher import caesarCipher
-import matplotlib.ticker as mticker
-from collections import Counter
-import matplotlib.pyplot as plt
+from caesarCracker import METHODS, crack
+from wordCipher import WORD_SHIFT_MODES, applyWordCipher, parallelWordCipher, streamWordCipher, validateAlphabet
+from cipherStream import DEFAULT_CHUNK_SIZE, openTextSink, openTextSource, readChunks, streamTransform, \
+    transformChunks
+from textNormalizer import CLEAN_TEXT, getNormalizer
+from stageProfiler import getProfiler, setProfiler
 from utils import checkPath
-import pandas as pd
 import argparse
-import re
+import atexit
+import io
+import itertools
+import mmap
 import os
-import random
-from typing import Optional, List
+import sys
+from contextlib import contextmanager
+from typing import Optional, List, TextIO
+
+# Same as parallelCipher.DEFAULT_PARALLEL_CHUNK_SIZE; kept here so plain runs
+# do not import parallelCipher (and with it the process pool) at start-up.
+DEFAULT_PARALLEL_CHUNK_SIZE = 16 << 20
 
 
 # -----------------------------
@@ -36,11 +46,45 @@ def getConsoleArguments() -> argparse.Namespace:
                         help='Save frequency table to a CSV file.')
     parser.add_argument('--savePlots', action='store_true',
                         help='Save frequency plots for each shift.')
+    parser.add_argument('--plotWorkers', type=int, default=None,
+                        help='Processes used to render --savePlots (default: one per CPU).')
+    parser.add_argument('--plotGrid', action='store_true',
+                        help='With --savePlots, also save all shifts in one small-multiples image.')
     parser.add_argument('--savePossibleShifts', action='store_true',
                         help='Save all possible shifts to a txt file.')
     parser.add_argument('--resultsPath', type=str,
                         default='../results/caesarCipher',
                         help='Path to save results (default: ../results/caesarCipher)')
+    parser.add_argument('--cache', action='store_true',
+                        help='Reuse stored analysis results (shifts, table, plots) for the same cleaned input '
+                             'and options, kept under resultsPath/.cache.')
+    parser.add_argument('--cacheMaxMB', type=int, default=512,
+                        help='Size limit of the --cache directory; least recently used entries go first '
+                             '(default: 512).')
+    parser.add_argument('--invalidateCache', action='store_true',
+                        help="With --cache, drop this input's stored results and recompute them.")
+    parser.add_argument('--clearCache', action='store_true',
+                        help='With --cache, empty the whole cache first.')
+
+    parser.add_argument('--crack', action='store_true',
+                        help='Rank shifts by letter frequency from a single histogram and decrypt only the best ones; '
+                             'with --wordCipher, recover every word\'s shift against a dictionary.')
+    parser.add_argument('--topK', type=int, default=3,
+                        help='Number of ranked candidates to decrypt with --crack (default: 3).')
+    parser.add_argument('--crackMethod', type=str, default='chi2', choices=list(METHODS),
+                        help='Scoring used by --crack: chi2 | loglik (default: chi2). '
+                             '--stream --crack always uses loglik, which its margin is measured in.')
+    parser.add_argument('--dictionary', type=str, default=None,
+                        help='Word list (one per line) added to the built-in one for --crack with --wordCipher.')
+    parser.add_argument('--crackMargin', type=float, default=50.0,
+                        help='With --stream --crack, stop reading once the best shift beats the runner-up and '
+                             'random letters by this many nats of log-likelihood (default: 50).')
+    parser.add_argument('--crackMinLetters', type=int, default=100,
+                        help='With --stream --crack, letters to read before stopping early (default: 100).')
+    parser.add_argument('--crackDecrypt', action='store_true',
+                        help='With --stream --crack, decrypt the whole stream with the found shift.')
+    parser.add_argument('--maxPeriod', type=int, default=300,
+                        help='Longest shift sequence tried by --crack with --wordShiftMode sequence/same (default: 300).')
 
     parser.add_argument('--keepNonAlpha', action='store_true',
                         help="Keep punctuation/digits as-is.")
@@ -49,8 +93,9 @@ def getConsoleArguments() -> argparse.Namespace:
                         help='Apply Caesar cipher per-word instead of to the whole text.')
 
     parser.add_argument('--wordShiftMode', type=str, default='same',
-                        choices=['same', 'random', 'sequence'],
-                        help="Per-word shift behavior: same | random | sequence (default: same).")
+                        choices=list(WORD_SHIFT_MODES),
+                        help="Per-word shift behavior: same | random | sequence | counter (default: same). "
+                             "counter derives each word's shift from --seed and the word index.")
 
     parser.add_argument('--wordShift', type=int, default=3,
                         help="Shift used when --wordShiftMode=same (default: 3).")
@@ -59,7 +104,11 @@ def getConsoleArguments() -> argparse.Namespace:
                         help='Comma-separated list of shifts for sequence mode. Example: 1,5,13,2')
 
     parser.add_argument('--seed', type=int, default=1234,
-                        help='Seed for random per-word shifts (default: 1234).')
+                        help='Seed for random/counter per-word shifts (default: 1234).')
+
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes for large inputs: whole-text mode, and word mode with '
+                             'same/sequence/counter shifts (default: 1).')
 
     parser.add_argument('--showWordShifts', action='store_true',
                         help='Print shift used for each word (and transformed word).')
@@ -70,25 +119,40 @@ def getConsoleArguments() -> argparse.Namespace:
     parser.add_argument('--noWizard', action='store_true',
                         help='Disable interactive prompts; require CLI flags.')
 
+    parser.add_argument('--stream', action='store_true',
+                        help='Process the input in fixed-size chunks with flat memory; reads stdin when no input is given.')
+    parser.add_argument('--outFile', type=str, default=None,
+                        help='Output file for --stream (default: stdout).')
+    parser.add_argument('--chunkSize', type=int, default=None,
+                        help=f'Characters per chunk for --stream (default: {DEFAULT_CHUNK_SIZE}), or bytes per '
+                             f'worker task in parallel whole-text mode (default: {DEFAULT_PARALLEL_CHUNK_SIZE}).')
+
+    parser.add_argument('--bytes', action='store_true',
+                        help='Transform --textFile as raw bytes through mmap (no cleaning or stripping), '
+                             'into a preallocated --outFile or back into the file with --inPlace.')
+    parser.add_argument('--inPlace', action='store_true',
+                        help='With --bytes, overwrite --textFile instead of writing --outFile.')
+
+    parser.add_argument('--profile', nargs='?', const='table', default=None, choices=['table', 'json'],
+                        help='Report wall/CPU time, bytes and tracemalloc peak per pipeline stage on stderr '
+                             '(default format: table).')
+    parser.add_argument('--profileOutput', type=str, default=None,
+                        help='Write the --profile report to this file instead of stderr.')
+    parser.add_argument('--profileDump', type=str, default=None,
+                        help='With --profile, save cProfile stats of the slowest stage (or --profileStage) here.')
+    parser.add_argument('--profileStage', type=str, default=None,
+                        help='Stage to run under cProfile for --profileDump (default: the slowest one).')
+
+    parser.add_argument('--crib', action='append', default=None,
+                        help='Known plaintext fragment to locate in whole-text ciphertext under any shift; '
+                             'repeat for several cribs, all found in one streamed pass.')
+
     return parser.parse_args()
 
 
 # -----------------------------
 # Helpers
 # -----------------------------
-def createPlot(frequency, shift, alphabet, resultsPath):
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.bar(list(alphabet), frequency.values)
-    ax.set_title(f'Frequency Analysis for Shift {shift}')
-    ax.set_xlabel('Letters')
-    ax.set_ylabel('Frequency')
-    ax.yaxis.set_major_locator(mticker.MaxNLocator(integer=True))
-    plt.tight_layout()
-    plot_filename = os.path.join(resultsPath, f'frequency_shift_{shift}.png')
-    plt.savefig(plot_filename)
-    plt.close(fig)
-
-
 def readTextFile(path: str) -> str:
     if not os.path.isfile(path):
         raise FileNotFoundError(f"File not found: {path}")
@@ -101,15 +165,7 @@ def countNonWhitespaceChars(raw_text: str) -> int:
 
 
 def cleanText_for_analysis(text: str) -> str:
-    text = text.strip().lower()
-    text = text.replace('\n', ' ').replace('\r', ' ')
-    text = re.sub(r'\s{2,}', ' ', text)
-    text = re.sub(r'[^a-z\s]', '', text)
-    return text
-
-
-def tokenize_preserving_whitespace_and_punct(raw_text: str):
-    return re.findall(r"[A-Za-z]+|[^A-Za-z]+", raw_text)
+    return CLEAN_TEXT.normalize(text)
 
 
 def parse_shift_sequence(seq_str: str) -> Optional[List[int]]:
@@ -217,63 +273,42 @@ def collect_user_input(is_decrypt: bool) -> tuple[Optional[str], Optional[str]]:
 # -----------------------------
 def apply_word_cipher(raw_text: str, cipher_obj: caesarCipher, alphabet: str, decrypt: bool,
                       word_shift_mode: str, word_shift: int, shift_sequence, seed: int,
-                      show_word_shifts: bool = False, save_word_shifts_path: Optional[str] = None) -> str:
-    tokens = tokenize_preserving_whitespace_and_punct(raw_text)
-    out_tokens = []
-
-    rng = random.Random(seed)
-    seq_idx = 0
-    word_idx = 0
-
-    log_lines = []
-    if word_shift_mode == "same":
-        log_lines.append(f"[wordShiftMode=same] shift={word_shift}")
-    elif word_shift_mode == "random":
-        log_lines.append(f"[wordShiftMode=random] seed={seed} (shift chosen per word)")
-    elif word_shift_mode == "sequence":
-        log_lines.append(f"[wordShiftMode=sequence] sequence={shift_sequence}")
-    log_lines.append("")
-
-    for tok in tokens:
-        if tok.isalpha():
-            word_idx += 1
-
-            if word_shift_mode == 'same':
-                shift = word_shift
-            elif word_shift_mode == 'random':
-                shift = rng.randint(1, len(alphabet) - 1)
-            elif word_shift_mode == 'sequence':
-                if not shift_sequence:
-                    raise ValueError("wordShiftMode=sequence requires --shiftSequence.")
-                shift = shift_sequence[seq_idx % len(shift_sequence)]
-                seq_idx += 1
-            else:
-                raise ValueError(f"Unknown wordShiftMode: {word_shift_mode}")
+                      show_word_shifts: bool = False, save_word_shifts_path: Optional[str] = None,
+                      workers: int = 1) -> str:
+    validateAlphabet(cipher_obj, alphabet)
 
-            cipher_obj.setConfig({
-                'shift': shift,
-                'alphabet': alphabet,
-                'preserve_nonalpha': True
-            })
+    if not (show_word_shifts or save_word_shifts_path):
+        return parallelWordCipher(raw_text, alphabet, decrypt, word_shift_mode, word_shift,
+                                  shift_sequence, seed, workers=workers)
 
-            original_word = tok.lower()
-            transformed_word = cipher_obj.decrypt(original_word) if decrypt else cipher_obj.encrypt(original_word)
-            out_tokens.append(transformed_word)
+    with open_word_shift_log(save_word_shifts_path, sys.stdout if show_word_shifts else None) as log:
+        return applyWordCipher(raw_text, alphabet, decrypt, word_shift_mode, word_shift,
+                               shift_sequence, seed, log=log)
 
-            log_lines.append(f'word #{word_idx}: "{original_word}" | shift={shift} | result="{transformed_word}"')
-        else:
-            out_tokens.append(tok)
 
-    if show_word_shifts:
-        print("\n".join(log_lines))
+@contextmanager
+def open_word_shift_log(save_path: Optional[str], echo: Optional[TextIO] = None):
+    """
+    Yields a callable that writes one log line to save_path and/or echo as
+    soon as it is produced, through buffered writers.
+    """
+    writers = [echo] if echo is not None else []
+    log_file = None
+    if save_path:
+        os.makedirs(os.path.dirname(save_path), exist_ok=True)
+        log_file = open(save_path, "w", encoding="utf-8", buffering=1 << 16)
+        writers.append(log_file)
 
-    if save_word_shifts_path:
-        os.makedirs(os.path.dirname(save_word_shifts_path), exist_ok=True)
-        with open(save_word_shifts_path, "w", encoding="utf-8") as f:
-            f.write("\n".join(log_lines))
-            f.write("\n")
+    def log(line: str) -> None:
+        for writer in writers:
+            writer.write(line)
+            writer.write("\n")
 
-    return "".join(out_tokens)
+    try:
+        yield log
+    finally:
+        if log_file:
+            log_file.close()
 
 
 # -----------------------------
@@ -297,7 +332,7 @@ def run_wizard(args: argparse.Namespace) -> argparse.Namespace:
             if args.wordCipher:
                 args.wordShiftMode = ask_choice(
                     "How was the ciphertext encrypted per-word?",
-                    ["same", "random", "sequence"],
+                    list(WORD_SHIFT_MODES),
                     default="same"
                 )
 
@@ -307,7 +342,7 @@ def run_wizard(args: argparse.Namespace) -> argparse.Namespace:
                         default=args.wordShift,
                         min_value=0
                     )
-                elif args.wordShiftMode == "random":
+                elif args.wordShiftMode in ("random", "counter"):
                     args.seed = ask_int(
                         "Enter the seed used during encryption",
                         default=args.seed,
@@ -323,8 +358,31 @@ def run_wizard(args: argparse.Namespace) -> argparse.Namespace:
                     min_value=0
                 )
 
+        elif args.wordCipher:
+            args.crack = True
+            args.wordShiftMode = ask_choice(
+                "How were the per-word shifts chosen (pick random if not sure)?",
+                list(WORD_SHIFT_MODES),
+                default="random"
+            )
+
+            if args.wordShiftMode in ("same", "sequence"):
+                print("The shift sequence will be recovered from letter statistics.")
+            else:
+                print("Each word's shift will be recovered against the built-in dictionary.")
+                dictionary = input("Extra dictionary file, one word per line [default: none]: ").strip().strip('"')
+                args.dictionary = dictionary or None
+            args.showWordShifts = ask_yes_no("Show recovered per-word shifts on screen?", default=True)
+            args.saveWordShifts = ask_yes_no("Save recovered per-word shift log to file?", default=False)
+
+            if args.saveWordShifts:
+                rp = input(f"Results folder path [default: {args.resultsPath}]: ").strip()
+                if rp:
+                    args.resultsPath = rp
+
         else:
-            args.savePossibleShifts = ask_yes_no("Save all possible shifts to a file?", default=True)
+            args.crack = ask_yes_no("Rank the most likely shifts by letter frequency?", default=True)
+            args.savePossibleShifts = ask_yes_no("Save all possible shifts to a file?", default=not args.crack)
             args.saveFrecuencyTable = ask_yes_no("Save frequency table CSV?", default=False)
             args.savePlots = ask_yes_no("Save plots per shift?", default=False)
 
@@ -332,14 +390,11 @@ def run_wizard(args: argparse.Namespace) -> argparse.Namespace:
             if rp:
                 args.resultsPath = rp
 
-            args.wordCipher = False
-            print("Note: Unknown-shift cracking is done in whole-text mode.")
-
     else:
         if args.wordCipher:
             args.wordShiftMode = ask_choice(
                 "Per-word shift mode?",
-                ["same", "random", "sequence"],
+                list(WORD_SHIFT_MODES),
                 default=args.wordShiftMode
             )
 
@@ -349,7 +404,7 @@ def run_wizard(args: argparse.Namespace) -> argparse.Namespace:
                     default=args.wordShift,
                     min_value=0
                 )
-            elif args.wordShiftMode == "random":
+            elif args.wordShiftMode in ("random", "counter"):
                 args.seed = ask_int(
                     "Enter seed (for reproducible random shifts)",
                     default=args.seed,
@@ -381,7 +436,7 @@ def run_wizard(args: argparse.Namespace) -> argparse.Namespace:
 
 
 def should_run_wizard(args: argparse.Namespace) -> bool:
-    if args.noWizard:
+    if args.noWizard or args.stream or args.bytes or args.crib:
         return False
 
     has_input = bool(args.textFile or args.text)
@@ -389,21 +444,292 @@ def should_run_wizard(args: argparse.Namespace) -> bool:
         return True
 
     minimal = has_input and not args.wordCipher and not args.decrypt and args.shift == 3 \
-              and not (args.saveFrecuencyTable or args.savePlots or args.savePossibleShifts)
+              and not (args.saveFrecuencyTable or args.savePlots or args.savePossibleShifts or args.crack)
     return minimal
 
 
+# -----------------------------
+# Streaming mode
+# -----------------------------
+def run_stream_mode(args: argparse.Namespace, alphabet: str) -> None:
+    if args.saveFrecuencyTable or args.savePlots or args.savePossibleShifts:
+        raise SystemExit("--stream only supports encryption/decryption and --crack.")
+
+    cipher_obj = caesarCipher()
+    cipher_obj.setConfig({
+        'shift': args.shift,
+        'alphabet': alphabet,
+        'preserve_nonalpha': args.keepNonAlpha
+    })
+
+    if args.text and not args.textFile:
+        source = io.StringIO(args.text)
+    else:
+        source = openTextSource(args.textFile)
+    sink = openTextSink(args.outFile)
+
+    try:
+        if args.crack:
+            run_stream_crack(args, alphabet, source, sink, cipher_obj)
+            return
+
+        if not args.wordCipher:
+            streamTransform(source, sink, cipher_obj, decrypt=args.decrypt,
+                            keepNonAlpha=args.keepNonAlpha, chunkSize=args.chunkSize or DEFAULT_CHUNK_SIZE)
+            return
+
+        save_path = None
+        if args.saveWordShifts:
+            checkPath(os.path.abspath(args.resultsPath))
+            save_path = os.path.join(args.resultsPath, "word_shifts.txt")
+
+        # Keep the log off stdout when the ciphertext itself goes there.
+        echo = (sys.stdout if args.outFile else sys.stderr) if args.showWordShifts else None
+
+        with open_word_shift_log(save_path, echo) as log:
+            streamWordCipher(source, sink, alphabet, args.decrypt, args.wordShiftMode, args.wordShift,
+                             parse_shift_sequence(args.shiftSequence), args.seed,
+                             keepNonAlpha=args.keepNonAlpha, chunkSize=args.chunkSize or DEFAULT_CHUNK_SIZE,
+                             log=log if (save_path or echo) else None)
+    finally:
+        source.close()
+        if args.outFile:
+            sink.close()
+
+
+def run_stream_crack(args: argparse.Namespace, alphabet: str, source: TextIO, sink: TextIO,
+                     cipher_obj: caesarCipher) -> None:
+    from streamCracker import DEFAULT_CRACK_CHUNK_SIZE, crackStream
+
+    if args.wordCipher:
+        raise SystemExit("--stream --crack only supports whole-text mode.")
+
+    # Small reads keep the time to an answer short; the rest of the stream
+    # is read with the regular chunk size.
+    chunkSize = args.chunkSize or DEFAULT_CHUNK_SIZE
+    chunks = readChunks(source, min(DEFAULT_CRACK_CHUNK_SIZE, chunkSize))
+
+    # A pipe cannot be read again, so what the crack reads is kept for the
+    # decryption: in memory up to a few chunks, in a temporary file beyond.
+    kept = None
+    if args.crackDecrypt and not source.seekable():
+        import tempfile
+
+        kept = tempfile.SpooledTemporaryFile(max_size=4 * chunkSize, mode='w+', encoding='utf-8', newline='')
+    ranked, letters, read, confident = crackStream(chunks, alphabet, margin=args.crackMargin,
+                                                   minLetters=args.crackMinLetters, keep=kept)
+
+    # Keep the report off stdout when the plaintext itself goes there.
+    report = sys.stderr if args.crackDecrypt and not args.outFile else sys.stdout
+    state = 'margin reached' if confident else 'end of input, margin not reached'
+    print(f"Most likely shifts after {letters} letters ({read} characters read, {state}):", file=report)
+    for rank, (shift, score) in enumerate(ranked[:max(args.topK, 1)], start=1):
+        print(f"{rank}) Shift {shift} (loglik score={score:.2f})", file=report)
+    report.flush()
+
+    if args.crackDecrypt:
+        cipher_obj.setConfig({
+            'shift': ranked[0][0],
+            'alphabet': alphabet,
+            'preserve_nonalpha': args.keepNonAlpha
+        })
+        # Files are simply read again from the start; pipes replay what the
+        # crack kept before the rest of the stream.
+        if kept is None:
+            source.seek(0)
+            chunks = readChunks(source, chunkSize)
+        else:
+            kept.seek(0)
+            chunks = itertools.chain(readChunks(kept, chunkSize), readChunks(source, chunkSize))
+        try:
+            transformChunks(chunks, sink, cipher_obj, decrypt=True, keepNonAlpha=args.keepNonAlpha,
+                            chunkSize=chunkSize)
+        finally:
+            if kept is not None:
+                kept.close()
+
+
+# -----------------------------
+# Bytes (mmap) mode
+# -----------------------------
+def run_bytes_mode(args: argparse.Namespace, alphabet: str) -> None:
+    if not args.textFile:
+        raise SystemExit("--bytes requires --textFile.")
+    if args.wordCipher or args.saveFrecuencyTable or args.savePlots or args.savePossibleShifts or args.crack:
+        raise SystemExit("--bytes only supports whole-text encryption/decryption.")
+    if args.inPlace == bool(args.outFile):
+        raise SystemExit("--bytes needs exactly one of --outFile or --inPlace.")
+
+    cipher_obj = caesarCipher()
+    cipher_obj.setConfig({
+        'shift': args.shift,
+        'alphabet': alphabet,
+        'preserve_nonalpha': args.keepNonAlpha
+    })
+    chunkSize = args.chunkSize or DEFAULT_PARALLEL_CHUNK_SIZE
+
+    try:
+        _transform_file_bytes(args, cipher_obj, chunkSize)
+    except ValueError as e:
+        raise SystemExit(f"{e} Use --keepNonAlpha to pass non-letters through unchanged.")
+
+
+def _transform_file_bytes(args: argparse.Namespace, cipher_obj: caesarCipher, chunkSize: int) -> None:
+    if args.inPlace:
+        with open(args.textFile, 'r+b') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0) as buffer:
+                if args.decrypt:
+                    cipher_obj.decrypt_inplace(buffer, chunkSize)
+                else:
+                    cipher_obj.encrypt_inplace(buffer, chunkSize)
+        return
+
+    import tempfile
+
+    # Written next to --outFile and renamed over it on success, so a rejected
+    # input leaves no zero-filled or half-written output behind.
+    fd, staging = tempfile.mkstemp(prefix='.' + os.path.basename(args.outFile) + '.',
+                                   dir=os.path.dirname(os.path.abspath(args.outFile)))
+    umask = os.umask(0)
+    os.umask(umask)
+    try:
+        # mkstemp creates the file 0600; give it the mode open() would have.
+        os.chmod(staging, 0o666 & ~umask)
+        with open(args.textFile, 'rb') as src, open(fd, 'w+b') as dst:
+            size = os.fstat(src.fileno()).st_size
+            dst.truncate(size)
+            if size:
+                with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as source, \
+                        mmap.mmap(dst.fileno(), size) as target:
+                    if args.decrypt:
+                        cipher_obj.decrypt_into(source, target, chunkSize)
+                    else:
+                        cipher_obj.encrypt_into(source, target, chunkSize)
+        os.replace(staging, args.outFile)
+    except BaseException:
+        os.unlink(staging)
+        raise
+
+
+# -----------------------------
+# Crib search
+# -----------------------------
+def run_crib_search(args: argparse.Namespace, alphabet: str) -> None:
+    from cribSearch import searchCribs
+
+    if args.text and not args.textFile:
+        source = io.StringIO(args.text)
+    else:
+        source = openTextSource(args.textFile)
+
+    found = 0
+    try:
+        for offset, shift, crib in searchCribs(readChunks(source, args.chunkSize or DEFAULT_CHUNK_SIZE),
+                                               args.crib, alphabet):
+            print(f"offset {offset}: '{crib}' with shift {shift}")
+            found += 1
+    except ValueError as e:
+        raise SystemExit(str(e))
+    finally:
+        source.close()
+
+    if not found:
+        print("No crib found.")
+
+
+# -----------------------------
+# Analysis cache
+# -----------------------------
+def open_analysis_cache(args: argparse.Namespace, cleaned: str, alphabet: str):
+    from analysisCache import analysisCache
+
+    cache = analysisCache(os.path.join(args.resultsPath, '.cache'), args.cacheMaxMB * 1024 * 1024)
+    if args.clearCache:
+        cache.clear()
+
+    key = cache.key(cleaned, alphabet, args.decrypt, {
+        'savePossibleShifts': args.savePossibleShifts,
+        'saveFrecuencyTable': args.saveFrecuencyTable,
+        'savePlots': args.savePlots,
+        'plotGrid': args.savePlots and args.plotGrid,
+    })
+    if args.invalidateCache:
+        cache.invalidate(key)
+    return cache, key, cache.lookup(key)
+
+
+def replay_cached_analysis(args: argparse.Namespace, cache, entry: str, cleaned: str) -> None:
+    """
+    Prints the stored shifts and copies the stored artifacts into resultsPath,
+    as if the analysis had just run.
+    """
+    from analysisCache import SHIFTS_FILE
+
+    print(f"All possible shifts for the text (cleaned): '{cleaned}': ")
+    with open(os.path.join(entry, SHIFTS_FILE), 'r', encoding='utf-8') as f:
+        sys.stdout.write(f.read())
+
+    names = [name for name in sorted(os.listdir(entry)) if name != SHIFTS_FILE or args.savePossibleShifts]
+    cache.restore(entry, names, args.resultsPath)
+
+    if args.saveFrecuencyTable:
+        print(f"Frequency table saved to '{os.path.join(args.resultsPath, 'frequency_table.csv')}'.")
+
+
+# -----------------------------
+# Profiling
+# -----------------------------
+def enable_profiling(args: argparse.Namespace) -> None:
+    from stageProfiler import stageProfiler
+
+    profiler = stageProfiler(cprofilePath=args.profileDump, cprofileStage=args.profileStage)
+    setProfiler(profiler)
+
+    # Registered at exit so every SystemExit path still reports.
+    def report() -> None:
+        if args.profileOutput:
+            with open(args.profileOutput, 'w', encoding='utf-8') as f:
+                profiler.report(args.profile, f)
+        else:
+            profiler.report(args.profile)
+
+    atexit.register(report)
+
+
 # -----------------------------
 # Main
 # -----------------------------
 if __name__ == "__main__":
     args = getConsoleArguments()
 
+    if args.profile:
+        enable_profiling(args)
+    profiler = getProfiler()
+
+    if args.bytes:
+        with profiler.stage('bytes'):
+            run_bytes_mode(args, 'abcdefghijklmnopqrstuvwxyz')
+        raise SystemExit(0)
+
+    if args.crib:
+        with profiler.stage('crib'):
+            run_crib_search(args, 'abcdefghijklmnopqrstuvwxyz')
+        raise SystemExit(0)
+
+    if args.stream:
+        with profiler.stage('stream'):
+            run_stream_mode(args, 'abcdefghijklmnopqrstuvwxyz')
+        raise SystemExit(0)
+
     if should_run_wizard(args):
         args = run_wizard(args)
 
     if args.textFile:
-        raw_text = readTextFile(args.textFile)
+        with profiler.stage('read') as stage:
+            raw_text = readTextFile(args.textFile)
+            stage.bytes = len(raw_text)
     elif args.text:
         raw_text = args.text
     else:
@@ -419,37 +745,90 @@ if __name__ == "__main__":
     if args.wordCipher:
         shift_sequence = parse_shift_sequence(args.shiftSequence)
 
-        if args.keepNonAlpha:
-            processed_text = raw_text.strip().lower()
-        else:
-            processed_text = cleanText_for_analysis(raw_text)
+        with profiler.stage('clean', len(raw_text)):
+            processed_text = getNormalizer(args.keepNonAlpha).normalize(raw_text)
 
         save_path = None
         if args.saveWordShifts:
             checkPath(os.path.abspath(args.resultsPath))
             save_path = os.path.join(args.resultsPath, "word_shifts.txt")
 
-        modifiedText = apply_word_cipher(
-            raw_text=processed_text,
-            cipher_obj=cipher,
-            alphabet=alphabet,
-            decrypt=args.decrypt,
-            word_shift_mode=args.wordShiftMode,
-            word_shift=args.wordShift,
-            shift_sequence=shift_sequence,
-            seed=args.seed,
-            show_word_shifts=args.showWordShifts,
-            save_word_shifts_path=save_path
-        )
+        if args.crack and args.wordShiftMode in ('same', 'sequence'):
+            from sequenceCracker import periodReportLines, recoverSequence
+
+            with profiler.stage('crack', len(processed_text)):
+                period, sequence, ioc, autocorrelation = recoverSequence(processed_text, alphabet,
+                                                                         maxPeriod=args.maxPeriod,
+                                                                         method=args.crackMethod)
+            print("Best periods by word-level index of coincidence:")
+            for line in periodReportLines(ioc, autocorrelation):
+                print(f"  {line}")
+            print(f"Recovered period {period}, shift sequence: {','.join(map(str, sequence))}")
+
+            with profiler.stage('cipher', len(processed_text)):
+                modifiedText = apply_word_cipher(
+                    raw_text=processed_text,
+                    cipher_obj=cipher,
+                    alphabet=alphabet,
+                    decrypt=True,
+                    word_shift_mode='sequence',
+                    word_shift=args.wordShift,
+                    shift_sequence=sequence,
+                    seed=args.seed,
+                    show_word_shifts=args.showWordShifts,
+                    save_word_shifts_path=save_path,
+                    workers=args.workers
+                )
+            print(f"Decrypted text (word-by-word):\n{modifiedText}")
+            raise SystemExit(0)
+
+        if args.crack:
+            from wordCracker import crackWordShifts, loadDictionary, shiftLogLines
+
+            with profiler.stage('crack', len(processed_text)):
+                plaintext, shifts, cipher_words = crackWordShifts(processed_text, alphabet,
+                                                                  loadDictionary(args.dictionary),
+                                                                  workers=args.workers)
+            if args.showWordShifts or save_path:
+                with open_word_shift_log(save_path, sys.stdout if args.showWordShifts else None) as log:
+                    for line in shiftLogLines(plaintext, shifts, cipher_words):
+                        log(line)
+
+            print(f"Decrypted text (per-word shifts recovered):\n{plaintext}")
+            raise SystemExit(0)
+
+        with profiler.stage('cipher', len(processed_text)):
+            modifiedText = apply_word_cipher(
+                raw_text=processed_text,
+                cipher_obj=cipher,
+                alphabet=alphabet,
+                decrypt=args.decrypt,
+                word_shift_mode=args.wordShiftMode,
+                word_shift=args.wordShift,
+                shift_sequence=shift_sequence,
+                seed=args.seed,
+                show_word_shifts=args.showWordShifts,
+                save_word_shifts_path=save_path,
+                workers=args.workers
+            )
 
         print(f"{'Decrypted' if args.decrypt else 'Encrypted'} text (word-by-word):\n{modifiedText}")
         raise SystemExit(0)
 
     # WHOLE-TEXT MODE
-    if args.keepNonAlpha:
-        text = raw_text.strip().lower()
-    else:
-        text = cleanText_for_analysis(raw_text)
+    if args.crack:
+        with profiler.stage('clean', len(raw_text)):
+            cleaned_for_crack = cleanText_for_analysis(raw_text)
+        with profiler.stage('crack', len(cleaned_for_crack)):
+            candidates = crack(cleaned_for_crack, alphabet, topK=args.topK,
+                               method=args.crackMethod, cipher_obj=cipher)
+
+        print(f"Most likely shifts ({args.crackMethod} against English letter frequencies):")
+        for rank, (shift, score, plaintext) in enumerate(candidates, start=1):
+            print(f"{rank}) Shift {shift} (score={score:.2f}): {plaintext}")
+
+        if not (args.saveFrecuencyTable or args.savePlots or args.savePossibleShifts):
+            raise SystemExit(0)
 
     if not (args.saveFrecuencyTable or args.savePlots or args.savePossibleShifts):
         cipher.setConfig({
@@ -457,53 +836,96 @@ if __name__ == "__main__":
             'alphabet': alphabet,
             'preserve_nonalpha': args.keepNonAlpha
         })
-        modifiedText = cipher.decrypt(text) if args.decrypt else cipher.encrypt(text)
-        print(f"{'Decrypted' if args.decrypt else 'Encrypted'} text:\n{modifiedText}")
+        normalizer = getNormalizer(args.keepNonAlpha)
+        with profiler.stage('cipher', len(raw_text)):
+            if args.workers > 1:
+                from parallelCipher import parallelDecrypt, parallelEncrypt
+
+                transform = parallelDecrypt if args.decrypt else parallelEncrypt
+                modifiedText = transform(cipher, normalizer.normalize(raw_text), workers=args.workers,
+                                         chunkSize=args.chunkSize or DEFAULT_PARALLEL_CHUNK_SIZE)
+            else:
+                # Normalization and the cipher mapping in one pass.
+                modifiedText = normalizer.transform(cipher, raw_text, decrypt=args.decrypt)
+        with profiler.stage('write', len(modifiedText)):
+            print(f"{'Decrypted' if args.decrypt else 'Encrypted'} text:\n{modifiedText}")
         raise SystemExit(0)
 
     checkPath(os.path.abspath(args.resultsPath))
 
-    cleaned_for_analysis = cleanText_for_analysis(raw_text)
-    frequencyTable = pd.DataFrame(columns=list(alphabet))
-    shiftLabels = []
+    with profiler.stage('clean', len(raw_text)):
+        cleaned_for_analysis = cleanText_for_analysis(raw_text)
+
+    cache = cache_key = staging = None
+    if args.cache:
+        with profiler.stage('cache'):
+            cache, cache_key, entry = open_analysis_cache(args, cleaned_for_analysis, alphabet)
+            if entry:
+                replay_cached_analysis(args, cache, entry, cleaned_for_analysis)
+        if entry:
+            raise SystemExit(0)
+        staging = cache.stage()
+        # Dropped at exit unless committed, so a failed run leaves nothing behind.
+        atexit.register(cache.discard, staging)
+
+    with profiler.stage('table', len(cleaned_for_analysis)):
+        # numpy/pandas are only needed from here on; plain encrypt/decrypt never loads them.
+        from frequencyTable import buildFrequencyTable
+
+        frequencyTable = buildFrequencyTable(cleaned_for_analysis, alphabet, decrypt=args.decrypt)
 
     shiftsFilename = os.path.join(args.resultsPath, 'possible_shifts.txt')
     possible_shifts_file = None
 
-    if args.savePossibleShifts:
-        possible_shifts_file = open(shiftsFilename, 'w', encoding='utf-8')
-
-    print(f"All possible shifts for the text (cleaned): '{cleaned_for_analysis}': ")
-    for shift in range(1, len(alphabet)):
-        cipher.setConfig({
-            'shift': shift,
-            'alphabet': alphabet,
-            'preserve_nonalpha': True
-        })
+    with profiler.stage('shifts', len(cleaned_for_analysis) * (len(alphabet) - 1)):
+        if args.savePossibleShifts:
+            possible_shifts_file = open(shiftsFilename, 'w', encoding='utf-8')
+        elif staging:
+            # The cache keeps the shifts either way to replay stdout on a hit.
+            possible_shifts_file = open(os.path.join(staging, os.path.basename(shiftsFilename)), 'w',
+                                        encoding='utf-8')
+
+        print(f"All possible shifts for the text (cleaned): '{cleaned_for_analysis}': ")
+        for shift in range(1, len(alphabet)):
+            cipher.setConfig({
+                'shift': shift,
+                'alphabet': alphabet,
+                'preserve_nonalpha': True
+            })
 
-        newText = cipher.decrypt(cleaned_for_analysis) if args.decrypt else cipher.encrypt(cleaned_for_analysis)
+            newText = cipher.decrypt(cleaned_for_analysis) if args.decrypt else cipher.encrypt(cleaned_for_analysis)
 
-        freq_counts = Counter(ch for ch in newText if ch in alphabet)
-        newRowSeries = pd.Series(0, index=list(alphabet))
-        newRowSeries.update(pd.Series(freq_counts))
+            print(f"Shift {shift}: {newText}")
 
-        newRow = pd.DataFrame([newRowSeries])
-        frequencyTable = pd.concat([frequencyTable, newRow], ignore_index=True)
+            if possible_shifts_file:
+                possible_shifts_file.write(f"Shift {shift}: {newText}\n")
 
-        shiftLabels.append(f'Shift {shift}')
-        print(f"Shift {shift}: {newText}")
+        if possible_shifts_file:
+            possible_shifts_file.close()
 
-        if args.savePlots:
-            createPlot(newRowSeries, shift, alphabet, args.resultsPath)
+    artifacts = [shiftsFilename] if args.savePossibleShifts else []
 
-        if args.savePossibleShifts and possible_shifts_file:
-            possible_shifts_file.write(f"Shift {shift}: {newText}\n")
+    if args.savePlots:
+        with profiler.stage('plots'):
+            from frequencyPlots import renderShiftPlots, renderSmallMultiples
 
-    if possible_shifts_file:
-        possible_shifts_file.close()
+            rows = frequencyTable.to_numpy().tolist()
+            shifts = list(range(1, len(alphabet)))
+            artifacts += renderShiftPlots(rows, shifts, alphabet, args.resultsPath, workers=args.plotWorkers)
+            if args.plotGrid:
+                artifacts.append(renderSmallMultiples(rows, shifts, alphabet, args.resultsPath))
 
     if args.saveFrecuencyTable:
-        frequencyTable.index = shiftLabels
         table_filename = os.path.join(args.resultsPath, 'frequency_table.csv')
-        frequencyTable.to_csv(table_filename, index=True)
-        print(f"Frequency table saved to '{table_filename}'.")
\ No newline at end of file
+        with profiler.stage('tableExport'):
+            frequencyTable.to_csv(table_filename, index=True)
+        artifacts.append(table_filename)
+        print(f"Frequency table saved to '{table_filename}'.")
+
+    if staging:
+        with profiler.stage('cache'):
+            try:
+                cache.commit(cache_key, staging, artifacts)
+            except OSError as e:
+                # The results are already written; only the cache entry is lost.
+                print(f"Warning: could not cache the analysis results: {e}", file=sys.stderr)
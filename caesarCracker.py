@@ -0,0 +1,118 @@
+# caesarCracker.py
+from caesarCipher import caesarCipher
+from typing import Dict, List, Optional, Tuple
+import math
+
+# Relative letter frequencies of English text (percent).
+ENGLISH_FREQUENCIES = {
+    'a': 8.167, 'b': 1.492, 'c': 2.782, 'd': 4.253, 'e': 12.702, 'f': 2.228,
+    'g': 2.015, 'h': 6.094, 'i': 6.966, 'j': 0.153, 'k': 0.772, 'l': 4.025,
+    'm': 2.406, 'n': 6.749, 'o': 7.507, 'p': 1.929, 'q': 0.095, 'r': 5.987,
+    's': 6.327, 't': 9.056, 'u': 2.758, 'v': 0.978, 'w': 2.360, 'x': 0.150,
+    'y': 1.974, 'z': 0.074,
+}
+
+METHODS = ('chi2', 'loglik')
+
+# Probability given to letters missing from the reference distribution.
+_FLOOR = 1e-6
+
+# Characters counted per block by letterHistogram; small enough to stay in cache.
+_HISTOGRAM_BLOCK = 1 << 16
+
+
+def letterHistogram(text: str, alphabet: str) -> List[int]:
+    """
+    Counts every alphabet letter in the text, in alphabet order.
+
+    The text is read once, block by block, and every letter is counted while
+    the block is still in cache instead of rescanning the whole text once per
+    letter.
+    """
+    histogram = [0] * len(alphabet)
+    for start in range(0, len(text), _HISTOGRAM_BLOCK):
+        block = text[start:start + _HISTOGRAM_BLOCK]
+        histogram = [total + block.count(ch) for total, ch in zip(histogram, alphabet)]
+    return histogram
+
+
+def rotateHistogram(histogram: List[int], shift: int) -> List[int]:
+    """
+    Returns the histogram the text would have after decrypting it with shift.
+
+    Decrypting moves index i to i - shift, so the new row is the old one
+    rotated left by shift.
+    """
+    shift %= len(histogram)
+    return histogram[shift:] + histogram[:shift]
+
+
+def referenceDistribution(alphabet: str, reference: Optional[Dict[str, float]] = None) -> List[float]:
+    """
+    Normalizes a letter -> weight mapping into probabilities in alphabet order.
+    """
+    reference = ENGLISH_FREQUENCIES if reference is None else reference
+    weights = [max(reference.get(ch, 0.0), 0.0) for ch in alphabet]
+    total = sum(weights)
+    if total <= 0:
+        raise ValueError("Reference distribution has no weight on the alphabet.")
+    return [max(w / total, _FLOOR) for w in weights]
+
+
+def scoreHistogram(histogram: List[int], expected: List[float], method: str = 'chi2') -> float:
+    """
+    Scores a histogram against expected probabilities; lower is better.
+
+    'chi2' is the chi-squared statistic, 'loglik' the negative log-likelihood.
+    """
+    total = sum(histogram)
+    if total == 0:
+        return 0.0
+
+    if method == 'chi2':
+        return sum((count - total * p) ** 2 / (total * p) for count, p in zip(histogram, expected))
+    if method == 'loglik':
+        return -sum(count * math.log(p) for count, p in zip(histogram, expected) if count)
+
+    raise ValueError(f"Unknown scoring method: {method}")
+
+
+def rankShifts(histogram: List[int], alphabet: str, method: str = 'chi2',
+               reference: Optional[Dict[str, float]] = None) -> List[Tuple[int, float]]:
+    """
+    Scores every candidate shift from a single histogram.
+
+    Returns (shift, score) pairs, best first, where shift is the key the text
+    was encrypted with.
+    """
+    if len(histogram) != len(alphabet):
+        raise ValueError("Histogram length must match the alphabet length.")
+
+    expected = referenceDistribution(alphabet, reference)
+    scores = [(shift, scoreHistogram(rotateHistogram(histogram, shift), expected, method))
+              for shift in range(len(alphabet))]
+    return sorted(scores, key=lambda item: item[1])
+
+
+def crack(text: str, alphabet: str = 'abcdefghijklmnopqrstuvwxyz', topK: int = 3,
+          method: str = 'chi2', reference: Optional[Dict[str, float]] = None,
+          cipher_obj: Optional[caesarCipher] = None) -> List[Tuple[int, float, str]]:
+    """
+    Cracks a whole-text Caesar ciphertext.
+
+    Counts the text once, ranks all shifts by rotating that histogram, and
+    decrypts only the topK best candidates. Returns (shift, score, plaintext)
+    tuples, best first.
+    """
+    ranked = rankShifts(letterHistogram(text, alphabet), alphabet, method, reference)
+
+    cipher_obj = cipher_obj or caesarCipher()
+    candidates = []
+    for shift, score in ranked[:max(topK, 0)]:
+        cipher_obj.setConfig({
+            'shift': shift,
+            'alphabet': alphabet,
+            'preserve_nonalpha': True
+        })
+        candidates.append((shift, score, cipher_obj.decrypt(text)))
+    return candidates
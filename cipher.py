@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Iterable, List, Union
 
 
 class cipher(ABC):
@@ -26,4 +26,62 @@ class cipher(ABC):
         """
         Sets the configuration for the cipher.
         """
-        pass
\ No newline at end of file
+        pass
+
+    def encrypt_bytes(self, data: bytes) -> bytes:
+        """
+        Encrypts UTF-8 bytes. This default decodes, calls encrypt() and
+        encodes the result; subclasses override it to work on the bytes
+        directly and keep their length.
+        """
+        return self.encrypt(bytes(data).decode('utf-8')).encode('utf-8')
+
+    def decrypt_bytes(self, data: bytes) -> bytes:
+        """
+        Decrypts UTF-8 bytes. This default decodes, calls decrypt() and
+        encodes the result; subclasses override it to work on the bytes
+        directly and keep their length.
+        """
+        return self.decrypt(bytes(data).decode('utf-8')).encode('utf-8')
+
+    def encrypt_inplace(self, buffer) -> None:
+        """
+        Encrypts a writable buffer (bytearray, mmap, ...) in place.
+        """
+        self._replace(buffer, self.encrypt_bytes(bytes(buffer)))
+
+    def decrypt_inplace(self, buffer) -> None:
+        """
+        Decrypts a writable buffer (bytearray, mmap, ...) in place.
+        """
+        self._replace(buffer, self.decrypt_bytes(bytes(buffer)))
+
+    @staticmethod
+    def _replace(buffer, data: bytes) -> None:
+        if len(data) != len(buffer):
+            raise ValueError("Cipher output length differs from the buffer; it cannot be done in place.")
+        buffer[:] = data
+
+    def encrypt_many(self, texts: Iterable[str]) -> List[Union[str, ValueError]]:
+        """
+        Encrypts each record. A record that fails is returned as its
+        ValueError instead of aborting the batch.
+        """
+        return self._many(self.encrypt, texts)
+
+    def decrypt_many(self, texts: Iterable[str]) -> List[Union[str, ValueError]]:
+        """
+        Decrypts each record. A record that fails is returned as its
+        ValueError instead of aborting the batch.
+        """
+        return self._many(self.decrypt, texts)
+
+    @staticmethod
+    def _many(func, texts: Iterable[str]) -> list:
+        results = []
+        for text in texts:
+            try:
+                results.append(func(text))
+            except ValueError as e:
+                results.append(e)
+        return results
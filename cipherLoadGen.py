@@ -0,0 +1,102 @@
+# cipherLoadGen.py
+from caesarCipherBenchmark import generateCorpus
+from cipherService import DEFAULT_PORT, percentile
+from typing import List, Optional, Tuple
+import argparse
+import asyncio
+import json
+import time
+
+
+def getConsoleArguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Generate load against a local cipherService.py and report latency percentiles."
+    )
+
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='TCP host (default: 127.0.0.1).')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'TCP port (default: {DEFAULT_PORT}).')
+    parser.add_argument('--socket', type=str, default=None, help='Connect to this Unix socket instead of TCP.')
+    parser.add_argument('--connections', type=int, default=8, help='Concurrent connections (default: 8).')
+    parser.add_argument('--requests', type=int, default=1000, help='Jobs per connection (default: 1000).')
+    parser.add_argument('--pipeline', type=int, default=16,
+                        help='Jobs in flight per connection (default: 16).')
+    parser.add_argument('--size', type=int, default=256, help='Characters per job text (default: 256).')
+    parser.add_argument('--largeEvery', type=int, default=0,
+                        help='Make every n-th job a --largeSize one (default: 0, never).')
+    parser.add_argument('--largeSize', type=int, default=1 << 20,
+                        help='Characters per large job (default: 1048576).')
+    parser.add_argument('--seed', type=int, default=1234, help='Seed for the generated texts (default: 1234).')
+
+    return parser.parse_args()
+
+
+async def openConnection(host: str, port: int, socketPath: Optional[str]):
+    limit = 256 * 1024 * 1024
+    if socketPath:
+        return await asyncio.open_unix_connection(socketPath, limit=limit)
+    return await asyncio.open_connection(host, port, limit=limit)
+
+
+async def runConnection(index: int, args: argparse.Namespace, small: str, large: str) -> Tuple[List[float], int]:
+    """
+    Sends args.requests jobs over one connection, keeping args.pipeline in
+    flight, and returns (latency of each job, failed jobs).
+    """
+    reader, writer = await openConnection(args.host, args.port, args.socket)
+    sent = {}
+    latencies = []
+    errors = 0
+    window = asyncio.Semaphore(max(args.pipeline, 1))
+
+    async def receive() -> None:
+        nonlocal errors
+        for _ in range(args.requests):
+            response = json.loads(await reader.readline())
+            errors += bool(response['error'])
+            latencies.append(time.perf_counter() - sent.pop(response['id']))
+            window.release()
+
+    receiver = asyncio.ensure_future(receive())
+    for number in range(args.requests):
+        await window.acquire()
+        job_id = f"{index}-{number}"
+        text = large if args.largeEvery and number % args.largeEvery == args.largeEvery - 1 else small
+        job = {'id': job_id, 'text': text, 'shift': number % 25 + 1, 'keepNonAlpha': True,
+               'mode': 'decrypt' if number % 2 else 'encrypt'}
+        sent[job_id] = time.perf_counter()
+        writer.write(json.dumps(job).encode('utf-8') + b'\n')
+        await writer.drain()
+
+    await receiver
+    writer.close()
+    return latencies, errors
+
+
+async def serverStats(args: argparse.Namespace) -> dict:
+    reader, writer = await openConnection(args.host, args.port, args.socket)
+    writer.write(b'{"op": "stats", "id": "stats"}\n')
+    await writer.drain()
+    response = json.loads(await reader.readline())
+    writer.close()
+    return response['stats']
+
+
+async def runLoad(args: argparse.Namespace) -> None:
+    small = generateCorpus(args.size, args.seed)
+    large = generateCorpus(args.largeSize, args.seed + 1) if args.largeEvery else ''
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(runConnection(i, args, small, large) for i in range(args.connections)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for result, _ in results for latency in result)
+    errors = sum(failed for _, failed in results)
+    print(f"{len(latencies)} jobs ({errors} failed) over {args.connections} connection(s) in {elapsed:.2f}s "
+          f"({len(latencies) / elapsed:,.0f} jobs/s)")
+    print(f"Client latency: p50 {percentile(latencies, 0.50) * 1000:.2f} ms, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.2f} ms")
+    print(f"Server metrics: {json.dumps(await serverStats(args))}")
+
+
+if __name__ == "__main__":
+    asyncio.run(runLoad(getConsoleArguments()))
@@ -0,0 +1,270 @@
+# cipherService.py
+from caesarBatch import getCipher, prepareJob, runJob
+from textNormalizer import getNormalizer
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+DEFAULT_PORT = 8765
+DEFAULT_BATCH_WINDOW_MS = 1.0
+DEFAULT_MAX_BATCH = 256
+DEFAULT_LARGE_BYTES = 64 * 1024
+DEFAULT_MAX_REQUEST_BYTES = 256 * 1024 * 1024
+LATENCY_SAMPLES = 10_000
+
+
+def getConsoleArguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Serve caesarBatch.py jobs over a local socket (one JSON object per line)."
+    )
+
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='TCP host (default: 127.0.0.1).')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'TCP port (default: {DEFAULT_PORT}).')
+    parser.add_argument('--socket', type=str, default=None,
+                        help='Listen on this Unix socket path instead of TCP.')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes for large, file and word-cipher jobs (default: CPU count).')
+    parser.add_argument('--batchWindowMs', type=float, default=DEFAULT_BATCH_WINDOW_MS,
+                        help='How long small jobs wait to be batched with others (default: '
+                             f'{DEFAULT_BATCH_WINDOW_MS} ms).')
+    parser.add_argument('--maxBatch', type=int, default=DEFAULT_MAX_BATCH,
+                        help=f'Jobs that flush a batch immediately (default: {DEFAULT_MAX_BATCH}).')
+    parser.add_argument('--largeBytes', type=int, default=DEFAULT_LARGE_BYTES,
+                        help=f'Texts at least this long go to the worker pool (default: {DEFAULT_LARGE_BYTES}).')
+    parser.add_argument('--statsInterval', type=float, default=0.0,
+                        help='Print metrics to stderr every this many seconds (default: off).')
+
+    return parser.parse_args()
+
+
+class serviceMetrics:
+    """
+    Request latencies (last LATENCY_SAMPLES) and queue depth, i.e. jobs
+    received but not answered yet.
+    """
+
+    def __init__(self):
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.batchedJobs = 0
+        self.pooledJobs = 0
+        self.queueDepth = 0
+        self.maxQueueDepth = 0
+
+    def enter(self) -> float:
+        self.queueDepth += 1
+        self.maxQueueDepth = max(self.maxQueueDepth, self.queueDepth)
+        return time.perf_counter()
+
+    def leave(self, started: float, failed: bool) -> None:
+        self.queueDepth -= 1
+        self.requests += 1
+        self.errors += failed
+        self.latencies.append(time.perf_counter() - started)
+
+    def snapshot(self) -> dict:
+        samples = sorted(self.latencies)
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'p50Ms': percentile(samples, 0.50) * 1000,
+            'p99Ms': percentile(samples, 0.99) * 1000,
+            'queueDepth': self.queueDepth,
+            'maxQueueDepth': self.maxQueueDepth,
+            'batches': self.batches,
+            'meanBatchSize': self.batchedJobs / self.batches if self.batches else 0.0,
+            'pooledJobs': self.pooledJobs,
+        }
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of sorted samples (0.0 when empty).
+    """
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, max(0, int(round(fraction * len(samples))) - 1))]
+
+
+class microBatcher:
+    """
+    Collects small whole-text jobs that share a cipher configuration for up
+    to `window` seconds (or maxBatch jobs) and runs them with one
+    encrypt_many/decrypt_many call on the event loop.
+    """
+
+    def __init__(self, metrics: serviceMetrics, window: float, maxBatch: int):
+        self.metrics = metrics
+        self.window = window
+        self.maxBatch = max(maxBatch, 1)
+        self._pending: Dict[Tuple[int, bool, bool], List[Tuple[str, asyncio.Future]]] = {}
+        self._timers: Dict[Tuple[int, bool, bool], asyncio.TimerHandle] = {}
+
+    def submit(self, shift: int, keepNonAlpha: bool, decrypt: bool, text: str) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        key = (shift, keepNonAlpha, decrypt)
+        future = loop.create_future()
+
+        items = self._pending.get(key)
+        if items is None:
+            items = self._pending[key] = []
+            self._timers[key] = loop.call_later(self.window, self._flush, key)
+        items.append((text, future))
+        if len(items) >= self.maxBatch:
+            self._flush(key)
+        return future
+
+    def _flush(self, key: Tuple[int, bool, bool]) -> None:
+        items = self._pending.pop(key, None)
+        self._timers.pop(key).cancel()
+        if not items:
+            return
+
+        shift, keepNonAlpha, decrypt = key
+        self.metrics.batches += 1
+        self.metrics.batchedJobs += len(items)
+        try:
+            cipher_obj = getCipher(shift, keepNonAlpha)
+            normalizer = getNormalizer(keepNonAlpha)
+            texts = [normalizer.normalize(text) for text, _ in items]
+            results = cipher_obj.decrypt_many(texts) if decrypt else cipher_obj.encrypt_many(texts)
+        except Exception as e:
+            results = [e] * len(items)
+
+        for (_, future), result in zip(items, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+class cipherService:
+    """
+    Line-delimited JSON server for caesarBatch.py jobs.
+
+    Each line is a job object (answered with {'id', 'result', 'error'}) or
+    {"op": "stats"} (answered with the metrics). Jobs on one connection run
+    concurrently and are answered as they finish, so clients match answers
+    by 'id'. Small whole-text jobs are micro-batched on the event loop;
+    file, word-cipher and large jobs run on a process pool so the loop never
+    blocks on them.
+    """
+
+    def __init__(self, workers: int = 1, batchWindow: float = DEFAULT_BATCH_WINDOW_MS / 1000,
+                 maxBatch: int = DEFAULT_MAX_BATCH, largeBytes: int = DEFAULT_LARGE_BYTES):
+        from concurrent.futures import ProcessPoolExecutor
+
+        self.metrics = serviceMetrics()
+        self.batcher = microBatcher(self.metrics, batchWindow, maxBatch)
+        self.largeBytes = largeBytes
+        self.pool = ProcessPoolExecutor(max_workers=max(workers, 1))
+
+    def close(self) -> None:
+        self.pool.shutdown(cancel_futures=True)
+
+    async def handleJob(self, job: dict) -> str:
+        # Validated here, before dispatch, so a malformed job fails fast on
+        # the loop instead of inside a worker.
+        job = prepareJob(job)
+        text = job['text']
+        if job['textFile'] or job['wordCipher'] or not isinstance(text, str) or len(text) >= self.largeBytes:
+            self.metrics.pooledJobs += 1
+            return await asyncio.get_running_loop().run_in_executor(self.pool, runJob, job)
+        return await self.batcher.submit(job['shift'], job['keepNonAlpha'], job['mode'] == 'decrypt', text)
+
+    async def handleLine(self, line: bytes) -> dict:
+        job_id = None
+        started = self.metrics.enter()
+        failed = True
+        try:
+            job = json.loads(line)
+            if not isinstance(job, dict):
+                raise ValueError("Job must be a JSON object.")
+            job_id = job.get('id')
+            if job.get('op') == 'stats':
+                failed = False
+                return {'id': job_id, 'stats': self.metrics.snapshot()}
+            result = {'id': job_id, 'result': await self.handleJob(job), 'error': None}
+            failed = False
+            return result
+        except Exception as e:
+            # Whatever the job raised (here or in a worker), the client gets
+            # an answer for its id.
+            return {'id': job_id, 'result': None, 'error': str(e) or type(e).__name__}
+        finally:
+            self.metrics.leave(started, failed)
+
+    async def handleConnection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        tasks = set()
+
+        async def answer(line: bytes) -> None:
+            response = await self.handleLine(line)
+            writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+            await writer.drain()
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    writer.write(b'{"id": null, "result": null, "error": "Request line too long."}\n')
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.ensure_future(answer(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def reportStats(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            print(json.dumps(self.metrics.snapshot()), file=sys.stderr, flush=True)
+
+    async def serve(self, host: str = '127.0.0.1', port: int = DEFAULT_PORT, socketPath: Optional[str] = None,
+                    statsInterval: float = 0.0) -> None:
+        if socketPath:
+            server = await asyncio.start_unix_server(self.handleConnection, socketPath,
+                                                     limit=DEFAULT_MAX_REQUEST_BYTES)
+            where = socketPath
+        else:
+            server = await asyncio.start_server(self.handleConnection, host, port, limit=DEFAULT_MAX_REQUEST_BYTES)
+            where = f"{host}:{port}"
+        print(f"Serving on {where}", file=sys.stderr, flush=True)
+
+        reporter = asyncio.ensure_future(self.reportStats(statsInterval)) if statsInterval > 0 else None
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if reporter:
+                reporter.cancel()
+
+
+if __name__ == "__main__":
+    args = getConsoleArguments()
+
+    service = cipherService(workers=args.workers, batchWindow=args.batchWindowMs / 1000,
+                            maxBatch=args.maxBatch, largeBytes=args.largeBytes)
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.socket, args.statsInterval))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
@@ -0,0 +1,188 @@
+# cipherStream.py
+from caesarCipher import caesarCipher
+from typing import Iterable, Iterator, Optional, TextIO
+import io
+import os
+import re
+import sys
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+_WHITESPACE_RUN = re.compile(r'\s{2,}')
+_NON_ALPHA = re.compile(r'[^a-z\s]')
+
+# Characters of look-behind/look-ahead kept around cuts inside a word, enough
+# for str.lower() to apply the final-sigma rule the same way as on the whole text.
+_CASE_CONTEXT = 64
+
+
+def openTextSource(path: Optional[str]) -> TextIO:
+    """
+    Opens a file the same way readTextFile does, or stdin when path is None.
+    """
+    if path is None:
+        return io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', errors='ignore')
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"File not found: {path}")
+    return open(path, 'r', encoding='utf-8', errors='ignore')
+
+
+def openTextSink(path: Optional[str]) -> TextIO:
+    """
+    Opens an output file, or stdout when path is None.
+    """
+    if path is None:
+        return sys.stdout
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+def readChunks(source: TextIO, chunkSize: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Yields fixed-size chunks of text until the source is exhausted.
+    """
+    while True:
+        chunk = source.read(chunkSize)
+        if not chunk:
+            return
+        yield chunk
+
+
+def segmentAtWhitespace(chunks: Iterable[str], limit: int = 4 * DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Re-cuts chunks so that every segment ends right before a whitespace run.
+
+    Words are never split across segments, so lowercasing (including the
+    final-sigma rule) gives the same result segment by segment as on the
+    whole text. To keep memory bounded, a whitespace-free run longer than
+    `limit` is cut anyway, and normalizeSegments lowercases across the cut
+    with a short context window; a whitespace run that reaches `limit` is
+    yielded on its own, and normalizeSegments collapses it together with its
+    continuation in the next segment.
+    """
+    carry = ''
+    for chunk in chunks:
+        buf = carry + chunk
+        cut = len(buf.rstrip())
+        if cut == len(buf):
+            parts = buf.rsplit(None, 1)
+            if len(parts) == 2:
+                cut = len(parts[0])
+            elif len(buf) < limit or '\u03a3' in buf[-_CASE_CONTEXT:]:
+                cut = 0
+        if cut:
+            yield buf[:cut]
+        carry = buf[cut:]
+        if len(carry) >= limit and carry.isspace():
+            yield carry
+            carry = ''
+
+    if carry:
+        yield carry
+
+
+def normalizeSegments(segments: Iterable[str], keepNonAlpha: bool) -> Iterator[str]:
+    """
+    Lowercases each segment and, unless keepNonAlpha is set, applies the
+    same cleaning as cleanText_for_analysis (minus the strip).
+
+    A segment that ends in whitespace was cut inside a long whitespace run,
+    which has already been collapsed to one space, so the rest of the run at
+    the start of the next segment is dropped.
+    """
+    tail = ''
+    for raw in segments:
+        continued = tail[-1:].isspace()
+        if tail and not raw[:1].isspace():
+            # The previous segment was cut mid-word: lowercase with its tail as context.
+            segment = (tail + raw).lower()[len(tail.lower()):]
+        else:
+            segment = raw.lower()
+        tail = raw[-_CASE_CONTEXT:]
+
+        if not keepNonAlpha:
+            if continued:
+                segment = segment.lstrip()
+            segment = segment.replace('\n', ' ').replace('\r', ' ')
+            segment = _WHITESPACE_RUN.sub(' ', segment)
+            segment = _NON_ALPHA.sub('', segment)
+        if segment:
+            yield segment
+
+
+def stripStream(pieces: Iterable[str], limit: int = 4 * DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Streaming equivalent of str.strip() over the concatenated pieces.
+
+    Leading whitespace is dropped, and trailing whitespace is held back until
+    more non-whitespace text follows it. Held-back whitespace beyond `limit`
+    characters is spilled to a temporary file, so memory stays bounded.
+    """
+    started = False
+    pending = ''
+    spill = None
+    try:
+        for piece in pieces:
+            if not started:
+                piece = piece.lstrip()
+                if not piece:
+                    continue
+                started = True
+
+            body = piece.rstrip()
+            if body:
+                if spill is not None:
+                    spill.write(pending)
+                    spill.seek(0)
+                    yield from readChunks(spill, limit)
+                    spill.close()
+                    spill, pending = None, ''
+                yield pending + body
+                pending = piece[len(body):]
+            else:
+                pending += piece
+                if len(pending) >= limit:
+                    if spill is None:
+                        import tempfile
+
+                        spill = tempfile.TemporaryFile('w+', encoding='utf-8', newline='')
+                    spill.write(pending)
+                    pending = ''
+    finally:
+        if spill is not None:
+            spill.close()
+
+
+def cipherStream(pieces: Iterable[str], cipher_obj: caesarCipher, decrypt: bool = False) -> Iterator[str]:
+    """
+    Applies the configured cipher to already normalized pieces.
+    """
+    for piece in pieces:
+        yield cipher_obj.transform(piece, decrypt=decrypt)
+
+
+def streamTransform(source: TextIO, sink: TextIO, cipher_obj: caesarCipher, decrypt: bool = False,
+                    keepNonAlpha: bool = True, chunkSize: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Reads, normalizes, encrypts/decrypts and writes the source chunk by chunk.
+
+    The output is identical to normalizing the whole text and calling
+    cipher_obj.encrypt/decrypt on it. Returns the number of characters written.
+    """
+    return transformChunks(readChunks(source, chunkSize), sink, cipher_obj, decrypt, keepNonAlpha, chunkSize)
+
+
+def transformChunks(chunks: Iterable[str], sink: TextIO, cipher_obj: caesarCipher, decrypt: bool = False,
+                    keepNonAlpha: bool = True, chunkSize: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    streamTransform over chunks that were already read, e.g. text buffered
+    by a caller followed by the rest of the source.
+    """
+    segments = segmentAtWhitespace(chunks, limit=4 * chunkSize)
+    pieces = stripStream(normalizeSegments(segments, keepNonAlpha), limit=4 * chunkSize)
+
+    written = 0
+    for out in cipherStream(pieces, cipher_obj, decrypt):
+        sink.write(out)
+        written += len(out)
+    sink.flush()
+    return written
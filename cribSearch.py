@@ -0,0 +1,150 @@
+# cribSearch.py
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+# Symbol emitted for every letter, after its difference to the previous
+# letter; a crib's first letter emits only this marker, since its difference
+# depends on text outside the crib.
+_LETTER = -1
+
+
+def differenceSymbols(text: str, alphabet: str, previous: int = None) -> List:
+    """
+    Encodes text as shift-invariant symbols: every letter becomes (difference
+    to the previous letter mod len(alphabet), _LETTER) and every other
+    character stands for itself. With previous=None the first letter emits
+    only _LETTER.
+    """
+    index = {ch: i for i, ch in enumerate(alphabet)}
+    size = len(alphabet)
+    symbols = []
+    for ch in text:
+        position = index.get(ch)
+        if position is None:
+            symbols.append(ch)
+            continue
+        if previous is not None:
+            symbols.append((position - previous) % size)
+        symbols.append(_LETTER)
+        previous = position
+    return symbols
+
+
+class cribAutomaton:
+    """
+    Aho-Corasick automaton over the difference symbols of several cribs.
+    """
+
+    def __init__(self, cribs: Iterable[str], alphabet: str):
+        self.alphabet = alphabet
+        self.cribs = []
+        self._goto: List[Dict] = [{}]
+        self._fail = [0]
+        self._out: List[List[int]] = [[]]
+
+        for crib in cribs:
+            crib = crib.lower()
+            letters = [i for i, ch in enumerate(crib) if ch in alphabet]
+            if not letters:
+                raise ValueError(f"Crib '{crib}' has no letters from the alphabet.")
+
+            # Non-letters before the first letter cannot sit between a text
+            # letter's difference and its marker, so they are checked against
+            # the recent text instead of being part of the pattern.
+            prefix = crib[:letters[0]]
+            self.cribs.append((crib, len(crib), alphabet.index(crib[letters[-1]]), prefix))
+            self._add(differenceSymbols(crib[letters[0]:], alphabet), len(self.cribs) - 1)
+
+        self._link()
+
+    def _add(self, symbols: List, crib_id: int) -> None:
+        node = 0
+        for symbol in symbols:
+            nxt = self._goto[node].get(symbol)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][symbol] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append(crib_id)
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for symbol, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and symbol not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(symbol, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+        # Resolve the failure links into complete transition tables so the
+        # scan does one dict lookup per symbol.
+        self._delta: List[Dict] = [dict(self._goto[0])] + [{}] * (len(self._goto) - 1)
+        order = list(self._goto[0].values())
+        for node in order:
+            order.extend(self._goto[node].values())
+        for node in order:
+            table = dict(self._delta[self._fail[node]])
+            table.update(self._goto[node])
+            self._delta[node] = table
+
+    def scan(self, chunks: Iterable[str]) -> Iterator[Tuple[int, int, str]]:
+        """
+        Feeds the text through the automaton and yields (offset, shift, crib)
+        for every match, carrying the state across chunks.
+        """
+        alphabet, size = self.alphabet, len(self.alphabet)
+        index = {ch: i for i, ch in enumerate(alphabet)}
+        for i, ch in enumerate(alphabet):
+            if len(ch.upper()) == 1:
+                index.setdefault(ch.upper(), i)
+
+        delta, out, cribs = self._delta, self._out, self.cribs
+        recent = deque(maxlen=max(length for _, length, _, _ in cribs))
+        track = any(prefix for _, _, _, prefix in cribs)
+        node = 0
+        previous = None
+        offset = 0
+        for chunk in chunks:
+            for ch in chunk:
+                if track:
+                    recent.append(ch)
+
+                position = index.get(ch)
+                if position is None:
+                    node = delta[node].get(ch, 0)
+                else:
+                    if previous is not None:
+                        node = delta[node].get((position - previous) % size, 0)
+                    node = delta[node].get(_LETTER, 0)
+                    previous = position
+
+                for crib_id in out[node]:
+                    crib, length, last_letter, prefix = cribs[crib_id]
+                    if prefix:
+                        if offset + 1 < length:
+                            continue
+                        start = len(recent) - length
+                        if ''.join(recent[start + i] for i in range(len(prefix))) != prefix:
+                            continue
+                    yield offset - length + 1, (previous - last_letter) % size, crib
+                offset += 1
+
+
+def searchCribs(chunks: Iterable[str], cribs: Iterable[str],
+                alphabet: str = 'abcdefghijklmnopqrstuvwxyz') -> Iterator[Tuple[int, int, str]]:
+    """
+    Finds every occurrence of the cribs in whole-text Caesar ciphertext under
+    any shift, in one pass over the chunks.
+
+    Yields (character offset, shift, crib) as soon as a match ends, where
+    shift is the key that encrypts the crib into the ciphertext at offset.
+    The 25 shifted copies of the text are never built.
+    """
+    return cribAutomaton(cribs, alphabet).scan(chunks)
@@ -0,0 +1,102 @@
+# frequencyPlots.py
+import os
+
+import matplotlib
+
+# Plots are only ever saved to disk, so avoid GUI backends unless one is requested explicitly.
+if 'MPLBACKEND' not in os.environ:
+    matplotlib.use('Agg')
+
+import matplotlib.ticker as mticker
+import matplotlib.pyplot as plt
+
+
+def _renderBatch(rows, shifts, alphabet, resultsPath):
+    """
+    Renders several shifts with a single figure, only updating bar heights.
+
+    Every row is a rotation of the same histogram, so the y-limits and tick
+    labels never change and the layout is computed once.
+    """
+    fig, ax = plt.subplots(figsize=(10, 6))
+    bars = ax.bar(list(alphabet), rows[0])
+    ax.set_xlabel('Letters')
+    ax.set_ylabel('Frequency')
+    ax.yaxis.set_major_locator(mticker.MaxNLocator(integer=True))
+    title = ax.set_title(f'Frequency Analysis for Shift {shifts[0]}')
+    fig.tight_layout()
+
+    filenames = []
+    for row, shift in zip(rows, shifts):
+        for bar, height in zip(bars, row):
+            bar.set_height(height)
+        title.set_text(f'Frequency Analysis for Shift {shift}')
+
+        plot_filename = os.path.join(resultsPath, f'frequency_shift_{shift}.png')
+        fig.savefig(plot_filename)
+        filenames.append(plot_filename)
+
+    plt.close(fig)
+    return filenames
+
+
+def renderShiftPlots(rows, shifts, alphabet, resultsPath, workers=None):
+    """
+    Saves frequency_shift_{shift}.png for every shift on a process pool.
+
+    Shifts are split into one contiguous batch per worker; each worker reuses
+    one figure for its batch. Returns the saved file names in shift order.
+    """
+    rows = [list(row) for row in rows]
+    shifts = list(shifts)
+    if not shifts:
+        return []
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(shifts)))
+    if workers == 1:
+        return _renderBatch(rows, shifts, alphabet, resultsPath)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    size = -(-len(shifts) // workers)
+    batches = [(rows[i:i + size], shifts[i:i + size]) for i in range(0, len(shifts), size)]
+
+    filenames = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_renderBatch, batchRows, batchShifts, alphabet, resultsPath)
+                   for batchRows, batchShifts in batches]
+        for future in futures:
+            filenames.extend(future.result())
+    return filenames
+
+
+def renderSmallMultiples(rows, shifts, alphabet, resultsPath, filename='frequency_shifts_grid.png'):
+    """
+    Saves one image holding the histogram of every shift as small multiples.
+    """
+    rows = [list(row) for row in rows]
+    shifts = list(shifts)
+    if not shifts:
+        return None
+
+    columns = min(5, len(shifts))
+    lines = -(-len(shifts) // columns)
+    fig, axes = plt.subplots(lines, columns, figsize=(3 * columns, 2.2 * lines),
+                             sharex=True, sharey=True, squeeze=False)
+
+    for ax, row, shift in zip(axes.flat, rows, shifts):
+        ax.bar(list(alphabet), row)
+        ax.set_title(f'Shift {shift}', fontsize=9)
+        ax.tick_params(labelsize=6)
+        ax.yaxis.set_major_locator(mticker.MaxNLocator(integer=True))
+
+    for ax in list(axes.flat)[len(shifts):]:
+        ax.set_visible(False)
+
+    fig.suptitle('Frequency Analysis for All Shifts')
+    fig.tight_layout()
+
+    plot_filename = os.path.join(resultsPath, filename)
+    fig.savefig(plot_filename)
+    plt.close(fig)
+    return plot_filename
@@ -0,0 +1,50 @@
+# frequencyTable.py
+from typing import Iterable, Optional
+import numpy as np
+import pandas as pd
+
+
+def letterCounts(text: str, alphabet: str) -> np.ndarray:
+    """
+    Counts every alphabet letter in the text with a single bincount.
+
+    ASCII alphabets are counted on the UTF-8 bytes through a 256-entry lookup
+    table; other alphabets fall back to str.count per letter.
+    """
+    size = len(alphabet)
+    if not alphabet.isascii():
+        return np.array([text.count(ch) for ch in alphabet], dtype=np.int64)
+
+    lookup = np.full(256, size, dtype=np.intp)
+    lookup[np.frombuffer(alphabet.encode('ascii'), dtype=np.uint8)] = np.arange(size)
+
+    codes = lookup[np.frombuffer(text.encode('utf-8'), dtype=np.uint8)]
+    return np.bincount(codes, minlength=size + 1)[:size].astype(np.int64)
+
+
+def shiftFrequencyMatrix(text: str, alphabet: str, shifts: Iterable[int], decrypt: bool = False) -> np.ndarray:
+    """
+    Returns the shift x letter count matrix of the text under each shift.
+
+    All rows are rotations of one histogram: encrypting with shift s moves
+    index j - s to j, decrypting moves j + s to j.
+    """
+    counts = letterCounts(text, alphabet)
+    shifts = np.asarray(list(shifts), dtype=np.intp)
+    direction = 1 if decrypt else -1
+
+    rotation = (np.arange(len(alphabet))[None, :] + direction * shifts[:, None]) % len(alphabet)
+    return counts[rotation]
+
+
+def buildFrequencyTable(text: str, alphabet: str, decrypt: bool = False,
+                        shifts: Optional[Iterable[int]] = None) -> pd.DataFrame:
+    """
+    Builds the frequency table exported by --saveFrecuencyTable.
+
+    Rows are labelled 'Shift k' for shifts 1..len(alphabet)-1 by default and
+    columns follow the alphabet order.
+    """
+    shifts = list(range(1, len(alphabet)) if shifts is None else shifts)
+    matrix = shiftFrequencyMatrix(text, alphabet, shifts, decrypt)
+    return pd.DataFrame(matrix, index=[f'Shift {shift}' for shift in shifts], columns=list(alphabet))
@@ -0,0 +1,87 @@
+# parallelCipher.py
+from caesarCipher import caesarCipher
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Optional
+import os
+
+DEFAULT_PARALLEL_CHUNK_SIZE = 16 << 20
+MIN_PARALLEL_SIZE = 8 << 20
+
+
+def byteTable(alphabet: str, shift: int, decrypt: bool = False) -> bytes:
+    """
+    Builds the 256-entry bytes.translate table for an ASCII alphabet.
+
+    Bytes of multi-byte UTF-8 characters are all >= 0x80 and map to
+    themselves, so translating UTF-8 data byte by byte gives the same text as
+    translating the decoded string.
+    """
+    shifted = alphabet[shift:] + alphabet[:shift]
+    source, target = (shifted, alphabet) if decrypt else (alphabet, shifted)
+    return bytes.maketrans(source.encode('ascii'), target.encode('ascii'))
+
+
+def _translateRegion(name: str, start: int, stop: int, table: bytes) -> None:
+    # Pool workers share the parent's resource tracker, which unlinks the
+    # segment once the parent does.
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        region = shm.buf[start:stop]
+        region[:] = region.tobytes().translate(table)
+        region.release()
+    finally:
+        shm.close()
+
+
+def parallelTransform(cipher_obj: caesarCipher, text: str, decrypt: bool = False, workers: Optional[int] = None,
+                      chunkSize: int = DEFAULT_PARALLEL_CHUNK_SIZE, minParallelSize: int = MIN_PARALLEL_SIZE) -> str:
+    """
+    Same result as cipher_obj.transform(text, decrypt) using a process pool.
+
+    The UTF-8 encoded text is placed in one shared-memory segment, and each
+    worker translates its chunks of that segment in place; the result is
+    decoded straight from the segment. Small inputs, a single worker,
+    non-ASCII alphabets and preserve_nonalpha=False use the serial path.
+    """
+    conf = cipher_obj.getConfig()
+    workers = workers or os.cpu_count() or 1
+
+    if (workers <= 1 or len(text) < minParallelSize or not conf['alphabet'].isascii()
+            or not conf['preserve_nonalpha']):
+        return cipher_obj.transform(text, decrypt=decrypt)
+
+    data = text.encode('utf-8')
+    size = len(data)
+    chunkSize = max(chunkSize, 1)
+    table = byteTable(conf['alphabet'], conf['shift'], decrypt)
+
+    shm = shared_memory.SharedMemory(create=True, size=size)
+    try:
+        shm.buf[:size] = data
+        del data
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_translateRegion, shm.name, start, min(start + chunkSize, size), table)
+                       for start in range(0, size, chunkSize)]
+            for future in futures:
+                future.result()
+
+        return str(shm.buf[:size], 'utf-8')
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def parallelEncrypt(cipher_obj: caesarCipher, text: str, **kwargs) -> str:
+    """
+    Parallel equivalent of cipher_obj.encrypt(text).
+    """
+    return parallelTransform(cipher_obj, text.lower().strip(), decrypt=False, **kwargs)
+
+
+def parallelDecrypt(cipher_obj: caesarCipher, ciphertext: str, **kwargs) -> str:
+    """
+    Parallel equivalent of cipher_obj.decrypt(ciphertext).
+    """
+    return parallelTransform(cipher_obj, ciphertext.lower().strip(), decrypt=True, **kwargs)
@@ -0,0 +1,280 @@
+# seedCracker.py
+from caesarCipher import getCompiledState
+from cipherStream import openTextSource
+from wordCipher import randomShifts, splitWords
+from wordCracker import loadDictionary
+from typing import FrozenSet, Iterable, List, Optional, Tuple
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+
+DEFAULT_CHECK_WORDS = 6
+DEFAULT_BLOCK_SIZE = 1 << 18
+DEFAULT_MIN_HIT_RATE = 0.5
+
+
+def getConsoleArguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Search a seed range for the seed of --wordShiftMode random ciphertext."
+    )
+
+    parser.add_argument('--text', type=str, help='Ciphertext input.')
+    parser.add_argument('--textFile', type=str, help='Path to a ciphertext file (default: stdin).')
+    parser.add_argument('--seedStart', type=int, default=0,
+                        help='First seed to try (default: 0).')
+    parser.add_argument('--seedStop', type=int, default=1 << 32,
+                        help='Stop before this seed (default: 2**32).')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes (default: CPU count).')
+    parser.add_argument('--blockSize', type=int, default=DEFAULT_BLOCK_SIZE,
+                        help=f'Seeds per worker task and checkpoint step (default: {DEFAULT_BLOCK_SIZE}).')
+    parser.add_argument('--checkWords', type=int, default=DEFAULT_CHECK_WORDS,
+                        help=f'Leading words that must decrypt to dictionary words (default: {DEFAULT_CHECK_WORDS}).')
+    parser.add_argument('--minHitRate', type=float, default=DEFAULT_MIN_HIT_RATE,
+                        help='Share of all words that must be dictionary words for a seed to be reported '
+                             f'(default: {DEFAULT_MIN_HIT_RATE}).')
+    parser.add_argument('--dictionary', type=str, default=None,
+                        help='Word list (one per line) added to the built-in one.')
+    parser.add_argument('--checkpoint', type=str, default=None,
+                        help='JSON checkpoint; an existing one for the same ciphertext resumes the search.')
+    parser.add_argument('--quiet', action='store_true',
+                        help='Do not report progress on stderr.')
+
+    return parser.parse_args()
+
+
+def dictionaryShifts(word: str, alphabet: str, dictionary: FrozenSet[str]) -> FrozenSet[int]:
+    """
+    Returns the random-mode shifts (1..len(alphabet)-1) that decrypt word into
+    a dictionary word.
+    """
+    return frozenset(shift for shift in range(1, len(alphabet))
+                     if word.translate(getCompiledState(alphabet, shift).decTable) in dictionary)
+
+
+def attachedWords(parts: List[str]) -> FrozenSet[int]:
+    """
+    Returns the positions of words glued to a neighbouring word, given
+    splitWords output: the pieces of a word with non-ASCII letters, such as
+    'na', 'ï' and 've' in 'naïve'.
+    """
+    last = len(parts) - 2
+    return frozenset(position for position, i in enumerate(range(1, len(parts), 2))
+                     if (i > 1 and not parts[i - 1]) or (i < last and not parts[i + 1]))
+
+
+def buildChecks(words: List[str], alphabet: str, dictionary: FrozenSet[str],
+                checkWords: int = DEFAULT_CHECK_WORDS,
+                skip: FrozenSet[int] = frozenset()) -> Tuple[Tuple[int, FrozenSet[int]], ...]:
+    """
+    Picks the first checkWords word positions whose allowed shifts actually
+    narrow the search, as (position, allowed shifts) pairs.
+
+    Words with no dictionary decryption (names, typos) or that decrypt to a
+    word under every shift are skipped rather than rejecting every seed, and
+    so are the positions in skip (fragments of a word, see attachedWords).
+    """
+    checks = []
+    for position, word in enumerate(words):
+        if position in skip:
+            continue
+        allowed = dictionaryShifts(word, alphabet, dictionary)
+        if allowed and len(allowed) < len(alphabet) - 1:
+            checks.append((position, allowed))
+            if len(checks) == checkWords:
+                break
+    return tuple(checks)
+
+
+def searchBlock(start: int, stop: int, checks, alphabet_size: int) -> List[int]:
+    """
+    Returns the seeds in [start, stop) whose leading shifts pass every check.
+
+    Only the shifts up to the first failing check are drawn: most seeds are
+    rejected after a single getrandbits call.
+    """
+    if not checks:
+        return list(range(start, stop))
+
+    width = alphabet_size - 1
+    bits = width.bit_length()
+    rng = random.Random()
+    reseed = rng.seed
+    draw = rng.getrandbits
+
+    first_position, first_allowed = checks[0]
+    survivors = []
+    for seed in range(start, stop):
+        reseed(seed)
+        for _ in range(first_position + 1):
+            value = draw(bits)
+            while value >= width:
+                value = draw(bits)
+        if value + 1 not in first_allowed:
+            continue
+
+        position = first_position
+        for next_position, allowed in checks[1:]:
+            while position < next_position:
+                value = draw(bits)
+                while value >= width:
+                    value = draw(bits)
+                position += 1
+            if value + 1 not in allowed:
+                break
+        else:
+            survivors.append(seed)
+    return survivors
+
+
+def _searchTask(args) -> Tuple[int, int, List[int]]:
+    start, stop, checks, alphabet_size = args
+    return start, stop, searchBlock(start, stop, checks, alphabet_size)
+
+
+def verifySeed(seed: int, words: List[str], alphabet: str, dictionary: FrozenSet[str]) -> Tuple[float, List[int]]:
+    """
+    Decrypts every word with the seed's shifts and returns (share of
+    dictionary words, shifts).
+    """
+    shifts = randomShifts(seed, len(words), len(alphabet))
+    hits = sum(word.translate(getCompiledState(alphabet, shift).decTable) in dictionary
+               for word, shift in zip(words, shifts))
+    return hits / max(len(words), 1), shifts
+
+
+def searchKey(words: List[str], alphabet: str, checks, seedStart: int, seedStop: int) -> str:
+    """
+    Identifies a search so that a checkpoint is only resumed for the same one.
+    """
+    payload = json.dumps([words, alphabet, [[p, sorted(a)] for p, a in checks], seedStart, seedStop])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def loadCheckpoint(path: Optional[str], key: str) -> dict:
+    if not path or not os.path.isfile(path):
+        return {'key': key, 'done': [], 'candidates': []}
+    with open(path, 'r', encoding='utf-8') as f:
+        state = json.load(f)
+    if state.get('key') != key:
+        raise ValueError(f"Checkpoint {path} belongs to a different ciphertext or seed range.")
+    return state
+
+
+def saveCheckpoint(path: Optional[str], state: dict) -> None:
+    if not path:
+        return
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def crackSeed(text: str, alphabet: str = 'abcdefghijklmnopqrstuvwxyz', seedStart: int = 0, seedStop: int = 1 << 32,
+              dictionary: Optional[FrozenSet[str]] = None, workers: int = 1, blockSize: int = DEFAULT_BLOCK_SIZE,
+              checkWords: int = DEFAULT_CHECK_WORDS, minHitRate: float = DEFAULT_MIN_HIT_RATE,
+              checkpoint: Optional[str] = None, progress=None) -> List[Tuple[int, float]]:
+    """
+    Searches [seedStart, seedStop) for the seed of random-mode ciphertext.
+
+    Blocks of seeds are filtered on a process pool by the leading-word
+    checks; survivors are verified against every word. Finished blocks and
+    candidates are written to the checkpoint after each block, so a rerun
+    skips them. Returns (seed, dictionary hit rate) pairs, best first.
+
+    Raises ValueError when no leading word narrows its shift, since every
+    seed would then have to be verified.
+    """
+    dictionary = loadDictionary() if dictionary is None else dictionary
+    parts = splitWords(text)
+    words = [word.lower() for word in parts[1::2]]
+    if not words:
+        raise ValueError("Ciphertext contains no words.")
+
+    checks = buildChecks(words, alphabet, dictionary, checkWords, attachedWords(parts))
+    if not checks:
+        # Every seed would survive the filter and be verified one by one.
+        raise ValueError("No word narrows the shift of its position, so the seed range cannot be filtered; "
+                         "use a longer ciphertext or add words with --dictionary.")
+    state = loadCheckpoint(checkpoint, searchKey(words, alphabet, checks, seedStart, seedStop))
+    done = set(state['done'])
+    candidates = {seed: rate for seed, rate in state['candidates']}
+
+    blockSize = max(blockSize, 1)
+    tasks = [(start, min(start + blockSize, seedStop), checks, len(alphabet))
+             for start in range(seedStart, seedStop, blockSize) if start not in done]
+    total = seedStop - seedStart
+    searched = total - sum(stop - start for start, stop, _, _ in tasks)
+    began = time.perf_counter()
+    fresh = 0
+
+    def finish(results: Iterable[Tuple[int, int, List[int]]]) -> None:
+        nonlocal searched, fresh
+        for start, stop, survivors in results:
+            for seed in survivors:
+                rate, _ = verifySeed(seed, words, alphabet, dictionary)
+                if rate >= minHitRate:
+                    candidates[seed] = rate
+
+            done.add(start)
+            searched += stop - start
+            fresh += stop - start
+            state['done'] = sorted(done)
+            state['candidates'] = sorted(candidates.items())
+            saveCheckpoint(checkpoint, state)
+
+            if progress:
+                elapsed = time.perf_counter() - began
+                progress(searched, total, fresh / elapsed if elapsed > 0 else 0.0, len(candidates))
+
+    if workers <= 1:
+        finish(_searchTask(task) for task in tasks)
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_searchTask, task) for task in tasks]
+            finish(future.result() for future in as_completed(futures))
+
+    return sorted(candidates.items(), key=lambda item: (-item[1], item[0]))
+
+
+def reportProgress(searched: int, total: int, rate: float, found: int) -> None:
+    print(f"\r{searched:,}/{total:,} seeds ({searched / max(total, 1):.1%}, {rate:,.0f} seeds/s), "
+          f"{found} candidate(s)", end='', file=sys.stderr, flush=True)
+
+
+if __name__ == "__main__":
+    args = getConsoleArguments()
+    alphabet = 'abcdefghijklmnopqrstuvwxyz'
+
+    if args.text and not args.textFile:
+        ciphertext = args.text
+    else:
+        with openTextSource(args.textFile) as source:
+            ciphertext = source.read()
+
+    found = crackSeed(ciphertext, alphabet, args.seedStart, args.seedStop,
+                      dictionary=loadDictionary(args.dictionary), workers=args.workers,
+                      blockSize=args.blockSize, checkWords=args.checkWords, minHitRate=args.minHitRate,
+                      checkpoint=args.checkpoint, progress=None if args.quiet else reportProgress)
+    if not args.quiet:
+        print(file=sys.stderr)
+
+    if not found:
+        print("No seed found in the searched range.")
+        raise SystemExit(1)
+
+    print("Candidate seeds (share of dictionary words):")
+    for seed, rate in found:
+        print(f"  seed={seed} ({rate:.1%})")
+
+    from wordCipher import applyWordCipher
+
+    best = found[0][0]
+    print(f"Decrypted text with seed {best}:")
+    print(applyWordCipher(ciphertext.strip().lower(), alphabet, True, 'random', 0, None, best))
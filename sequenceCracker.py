@@ -0,0 +1,116 @@
+# sequenceCracker.py
+from caesarCracker import rankShifts
+from wordCipher import splitWords
+from typing import List, Tuple
+import numpy as np
+
+DEFAULT_MAX_PERIOD = 300
+
+# A period is accepted once its index of coincidence closes this fraction of
+# the gap between uniformly random letters (1 / alphabet size) and the best
+# period; multiples of the true period score as high, so the smallest such
+# period wins.
+_IOC_ACCEPT = 0.75
+
+
+def wordArrays(text: str, alphabet: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns (word ids, letter codes, word index of each letter) for the words
+    of a word-cipher ciphertext; letters outside the alphabet are dropped.
+    """
+    words = [word.lower() for word in splitWords(text)[1::2]]
+    if not words:
+        empty = np.zeros(0, dtype=np.int32)
+        return empty, empty, empty
+
+    index = {}
+    word_ids = np.array([index.setdefault(word, len(index)) for word in words], dtype=np.int32)
+
+    # Indexed by code point; the last slot (-1) catches everything beyond it.
+    lookup = np.full(max(map(ord, alphabet)) + 2, -1, dtype=np.int32)
+    lookup[[ord(ch) for ch in alphabet]] = np.arange(len(alphabet), dtype=np.int32)
+
+    codes = np.frombuffer(''.join(words).encode('utf-32-le'), dtype='<u4')
+    letters = lookup[np.minimum(codes, len(lookup) - 1)]
+    owners = np.repeat(np.arange(len(words), dtype=np.int32), [len(word) for word in words])
+    keep = letters >= 0
+    return word_ids, letters[keep], owners[keep]
+
+
+def classHistograms(letters: np.ndarray, owners: np.ndarray, period: int, size: int) -> np.ndarray:
+    """
+    Letter histogram of every residue class (word index mod period), as a
+    period x size matrix, from a single bincount.
+    """
+    keys = (owners % period) * size + letters
+    return np.bincount(keys, minlength=period * size).reshape(period, size)
+
+
+def periodStatistics(text: str, alphabet: str, maxPeriod: int = DEFAULT_MAX_PERIOD) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns (ioc, autocorrelation) indexed by period 1..maxPeriod (index 0
+    is unused).
+
+    ioc is the letter index of coincidence averaged over the residue classes,
+    weighted by their size; autocorrelation is the fraction of words equal to
+    the word `period` positions later, which only repeated plaintext words
+    encrypted with the same shift produce.
+    """
+    return _statistics(*wordArrays(text, alphabet), len(alphabet), maxPeriod)
+
+
+def _statistics(word_ids: np.ndarray, letters: np.ndarray, owners: np.ndarray, size: int,
+                maxPeriod: int) -> Tuple[np.ndarray, np.ndarray]:
+    maxPeriod = max(1, min(maxPeriod, len(word_ids)))
+
+    ioc = np.zeros(maxPeriod + 1)
+    autocorrelation = np.zeros(maxPeriod + 1)
+    for period in range(1, maxPeriod + 1):
+        counts = classHistograms(letters, owners, period, size)
+        totals = counts.sum(axis=1)
+        pairs = totals * (totals - 1)
+        if pairs.sum():
+            ioc[period] = (counts * (counts - 1)).sum() / pairs.sum()
+
+        if period < len(word_ids):
+            autocorrelation[period] = np.mean(word_ids[period:] == word_ids[:-period])
+
+    return ioc, autocorrelation
+
+
+def findPeriod(ioc: np.ndarray, size: int) -> int:
+    """
+    Picks the smallest period whose index of coincidence is close to the best.
+    """
+    if len(ioc) <= 2:
+        return 1
+    best = ioc[1:].max()
+    threshold = 1 / size + _IOC_ACCEPT * (best - 1 / size)
+    return int(np.argmax(ioc[1:] >= threshold)) + 1
+
+
+def recoverSequence(text: str, alphabet: str = 'abcdefghijklmnopqrstuvwxyz', maxPeriod: int = DEFAULT_MAX_PERIOD,
+                    method: str = 'chi2') -> Tuple[int, List[int], np.ndarray, np.ndarray]:
+    """
+    Recovers the shift sequence of --wordShiftMode sequence ciphertext.
+
+    Finds the period from the statistics above, then ranks the shifts of each
+    residue class by rotating its histogram (caesarCracker.rankShifts).
+    Returns (period, sequence, ioc, autocorrelation); 'same' ciphertext comes
+    back with period 1.
+    """
+    word_ids, letters, owners = wordArrays(text, alphabet)
+    ioc, autocorrelation = _statistics(word_ids, letters, owners, len(alphabet), maxPeriod)
+    period = findPeriod(ioc, len(alphabet))
+
+    counts = classHistograms(letters, owners, period, len(alphabet))
+    sequence = [rankShifts(row.tolist(), alphabet, method)[0][0] for row in counts]
+    return period, sequence, ioc, autocorrelation
+
+
+def periodReportLines(ioc: np.ndarray, autocorrelation: np.ndarray, top: int = 5) -> List[str]:
+    """
+    Lists the periods with the highest index of coincidence.
+    """
+    order = np.argsort(-ioc[1:])[:top] + 1
+    return [f"period {p}: ioc={ioc[p]:.4f} autocorrelation={autocorrelation[p]:.4f}" for p in order]
@@ -0,0 +1,266 @@
+# signatureIndex.py
+from caesarCipher import getCompiledState
+from wordCipher import WORD_SPLIT_PATTERN
+from typing import Iterable, Iterator, List, Optional, Tuple
+from collections import Counter
+import argparse
+import hashlib
+import os
+import sqlite3
+import sys
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    mtime INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    signature BLOB NOT NULL,
+    rotation INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_signature ON files (signature);
+CREATE TABLE IF NOT EXISTS words (
+    signature TEXT NOT NULL,
+    file_id INTEGER NOT NULL,
+    rotation INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (signature, file_id, rotation)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS words_file ON words (file_id);
+"""
+
+
+def getConsoleArguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Index Caesar ciphertext files by shift-invariant signatures and query them under any shift."
+    )
+
+    parser.add_argument('--db', type=str, required=True, help='Path to the SQLite index.')
+    parser.add_argument('--update', type=str, nargs='+', default=None,
+                        help='Files or directories to (re)index; unchanged files are skipped and '
+                             'deleted ones under these paths are dropped.')
+    parser.add_argument('--samePlaintext', type=str, default=None,
+                        help='File whose plaintext to look up under any shift.')
+    parser.add_argument('--sameText', type=str, default=None,
+                        help='Ciphertext or plaintext to look up under any shift.')
+    parser.add_argument('--word', action='append', default=None,
+                        help='Plaintext word to find under any shift (repeatable).')
+    parser.add_argument('--quiet', action='store_true',
+                        help='Do not report indexing progress on stderr.')
+
+    return parser.parse_args()
+
+
+def rotationOf(text: str, alphabet: str) -> int:
+    """
+    Index of the first alphabet letter of text, or 0 when it has none.
+    """
+    for ch in text:
+        position = alphabet.find(ch)
+        if position >= 0:
+            return position
+    return 0
+
+
+def canonicalText(text: str, alphabet: str) -> Tuple[str, int]:
+    """
+    Returns (text rotated so its first letter becomes alphabet[0], rotation).
+
+    Every Caesar shift of the same plaintext has the same canonical text, and
+    shifting b by (rotation_b - rotation_a) turns a into b. Text is stripped
+    and lowercased first, as caesarCipher.encrypt does.
+    """
+    text = text.strip().lower()
+    rotation = rotationOf(text, alphabet)
+    return text.translate(getCompiledState(alphabet, rotation).decTable), rotation
+
+
+def textSignature(text: str, alphabet: str) -> Tuple[bytes, int]:
+    """
+    Returns (sha256 of the canonical text, rotation).
+    """
+    canonical, rotation = canonicalText(text, alphabet)
+    return hashlib.sha256(canonical.encode('utf-8')).digest(), rotation
+
+
+def wordSignatures(text: str, alphabet: str) -> Iterator[Tuple[str, int, int]]:
+    """
+    Yields (canonical word, rotation, occurrences) for the distinct words of
+    text.
+    """
+    for word, count in Counter(word.lower() for word in WORD_SPLIT_PATTERN.split(text)[1::2]).items():
+        canonical, rotation = canonicalText(word, alphabet)
+        yield canonical, rotation, count
+
+
+def iterFiles(paths: Iterable[str]) -> Iterator[str]:
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    yield os.path.join(root, name)
+        elif os.path.isfile(path):
+            yield path
+        else:
+            raise FileNotFoundError(f"File not found: {path}")
+
+
+class signatureIndex:
+    """
+    SQLite index from shift-invariant signatures to ciphertext files.
+
+    Each file is stored with the signature and rotation of its whole text and
+    of every distinct word, so "same plaintext under any shift" and
+    "contains this word under any shift" are single index lookups; the shift
+    between a query and a match falls out of the two rotations.
+    """
+
+    def __init__(self, path: str, alphabet: str = 'abcdefghijklmnopqrstuvwxyz'):
+        self.alphabet = alphabet
+        # The database and its journal files are never indexed, even when
+        # they live under an indexed directory.
+        database = os.path.abspath(path)
+        self.ownFiles = frozenset(database + suffix for suffix in ('', '-wal', '-shm', '-journal'))
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(_SCHEMA)
+
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'alphabet'").fetchone()
+        if row is None:
+            with self.connection:
+                self.connection.execute("INSERT INTO meta VALUES ('alphabet', ?)", (alphabet,))
+        elif row[0] != alphabet:
+            raise ValueError(f"Index {path} was built for alphabet '{row[0]}'.")
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def update(self, paths: Iterable[str], progress=None) -> Tuple[int, int, int]:
+        """
+        Indexes new and changed files under paths, skipping those whose mtime
+        and size match the index, and drops indexed files under paths that no
+        longer exist, including listed files or directories that were deleted
+        themselves. The index's own database files are skipped. Returns
+        (indexed, unchanged, removed).
+        """
+        paths = [os.path.abspath(path) for path in paths]
+        known = {path: (file_id, mtime, size) for file_id, path, mtime, size
+                 in self.connection.execute("SELECT id, path, mtime, size FROM files")}
+        indexed = unchanged = 0
+        seen = set()
+
+        # A deleted path is only an error when nothing was indexed under it.
+        missing = [path for path in paths if not os.path.exists(path)]
+        for path in missing:
+            root = path.rstrip(os.sep) + os.sep
+            if path not in known and not any(name.startswith(root) for name in known):
+                raise FileNotFoundError(f"File not found: {path}")
+
+        with self.connection:
+            for path in iterFiles(path for path in paths if path not in missing):
+                if path in self.ownFiles:
+                    continue
+                seen.add(path)
+                stat = os.stat(path)
+                entry = known.get(path)
+                if entry and entry[1:] == (stat.st_mtime_ns, stat.st_size):
+                    unchanged += 1
+                    continue
+
+                with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                    text = f.read()
+                self._store(path, stat.st_mtime_ns, stat.st_size, text, entry[0] if entry else None)
+                indexed += 1
+                if progress:
+                    progress(indexed, unchanged, path)
+
+            roots = [path.rstrip(os.sep) + os.sep for path in paths if os.path.isdir(path) or path in missing]
+            stale = [entry[0] for path, entry in known.items()
+                     if path not in seen and (path in paths or any(path.startswith(root) for root in roots))]
+            for file_id in stale:
+                self._remove(file_id)
+
+        return indexed, unchanged, len(stale)
+
+    def _store(self, path: str, mtime: int, size: int, text: str, file_id: Optional[int]) -> None:
+        signature, rotation = textSignature(text, self.alphabet)
+        if file_id is None:
+            file_id = self.connection.execute(
+                "INSERT INTO files (path, mtime, size, signature, rotation) VALUES (?, ?, ?, ?, ?)",
+                (path, mtime, size, signature, rotation)).lastrowid
+        else:
+            self.connection.execute(
+                "UPDATE files SET mtime = ?, size = ?, signature = ?, rotation = ? WHERE id = ?",
+                (mtime, size, signature, rotation, file_id))
+            self.connection.execute("DELETE FROM words WHERE file_id = ?", (file_id,))
+
+        self.connection.executemany(
+            "INSERT INTO words (signature, file_id, rotation, count) VALUES (?, ?, ?, ?)",
+            ((word, file_id, word_rotation, count)
+             for word, word_rotation, count in wordSignatures(text, self.alphabet)))
+
+    def _remove(self, file_id: int) -> None:
+        self.connection.execute("DELETE FROM words WHERE file_id = ?", (file_id,))
+        self.connection.execute("DELETE FROM files WHERE id = ?", (file_id,))
+
+    def samePlaintext(self, text: str) -> List[Tuple[str, int]]:
+        """
+        Returns (path, shift) for every indexed file that is text encrypted
+        with shift (text itself may be plaintext or any shift of it).
+        """
+        signature, rotation = textSignature(text, self.alphabet)
+        size = len(self.alphabet)
+        return [(path, (file_rotation - rotation) % size) for path, file_rotation in self.connection.execute(
+            "SELECT path, rotation FROM files WHERE signature = ? ORDER BY path", (signature,))]
+
+    def findWord(self, word: str) -> List[Tuple[str, int, int]]:
+        """
+        Returns (path, shift, occurrences) for every indexed file containing
+        word encrypted with shift.
+        """
+        canonical, rotation = canonicalText(word, self.alphabet)
+        size = len(self.alphabet)
+        return [(path, (word_rotation - rotation) % size, count) for path, word_rotation, count in self.connection.execute(
+            "SELECT files.path, words.rotation, words.count FROM words JOIN files ON files.id = words.file_id "
+            "WHERE words.signature = ? ORDER BY files.path, words.rotation", (canonical,))]
+
+
+def reportProgress(indexed: int, unchanged: int, path: str) -> None:
+    print(f"\rindexed {indexed:,}, unchanged {unchanged:,}", end='', file=sys.stderr, flush=True)
+
+
+if __name__ == "__main__":
+    args = getConsoleArguments()
+
+    with signatureIndex(args.db) as index:
+        if args.update:
+            indexed, unchanged, removed = index.update(args.update, None if args.quiet else reportProgress)
+            if not args.quiet:
+                print(file=sys.stderr)
+            print(f"Indexed {indexed} file(s), {unchanged} unchanged, {removed} removed.")
+
+        if args.samePlaintext or args.sameText:
+            if args.samePlaintext:
+                with open(args.samePlaintext, 'r', encoding='utf-8', errors='ignore') as f:
+                    query = f.read()
+            else:
+                query = args.sameText
+            matches = index.samePlaintext(query)
+            print(f"Same plaintext: {len(matches)} file(s)")
+            for path, shift in matches:
+                print(f"  {path} (shift {shift})")
+
+        for word in args.word or []:
+            matches = index.findWord(word)
+            print(f"Word '{word}': {len(matches)} file(s)")
+            for path, shift, count in matches:
+                print(f"  {path} (shift {shift}, {count}x)")
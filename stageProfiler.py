@@ -0,0 +1,177 @@
+# stageProfiler.py
+from typing import List, Optional, TextIO
+import sys
+import time
+import tracemalloc
+
+
+class stageRecord:
+    """
+    Measurements of one pipeline stage; `bytes` may be set inside the stage.
+    """
+    __slots__ = ('name', 'wall', 'cpu', 'bytes', 'peak', '_profile', '_start', '_cpuStart', '_memStart',
+                 '_profiler')
+
+    def __init__(self, profiler: 'stageProfiler', name: str, nbytes: int):
+        self.name = name
+        self.bytes = nbytes
+        self.wall = self.cpu = 0.0
+        self.peak = None
+        self._profile = None
+        self._profiler = profiler
+
+    def __enter__(self) -> 'stageRecord':
+        profiler = self._profiler
+        if profiler.memory and tracemalloc.is_tracing():
+            # Peaks are reported relative to what was allocated when the
+            # stage began, so earlier stages do not show up in later ones.
+            self._memStart = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        if profiler.wantsProfile(self.name):
+            import cProfile
+
+            self._profile = cProfile.Profile()
+            profiler._profiling = True
+            self._profile.enable()
+        self._cpuStart = time.process_time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.wall = time.perf_counter() - self._start
+        self.cpu = time.process_time() - self._cpuStart
+        if self._profile is not None:
+            self._profile.disable()
+            self._profiler._profiling = False
+        if self._profiler.memory and tracemalloc.is_tracing():
+            self.peak = max(tracemalloc.get_traced_memory()[1] - self._memStart, 0)
+        self._profiler._finish(self)
+
+    def asDict(self) -> dict:
+        return {'stage': self.name, 'wall': self.wall, 'cpu': self.cpu, 'bytes': self.bytes, 'peakBytes': self.peak}
+
+
+class _nullStage:
+    """
+    Shared no-op stage handed out while profiling is off.
+    """
+    __slots__ = ('bytes',)
+
+    def __enter__(self) -> '_nullStage':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NULL_STAGE = _nullStage()
+
+
+class nullProfiler:
+    """
+    Profiler used when --profile is off: stage() returns one shared object,
+    so an instrumented stage costs a method call and nothing else.
+    """
+    enabled = False
+
+    def stage(self, name: str, nbytes: int = 0) -> _nullStage:
+        return _NULL_STAGE
+
+
+class stageProfiler:
+    """
+    Records wall time, CPU time, bytes processed and the tracemalloc peak
+    above the stage's starting allocation, per pipeline stage, in the order
+    the stages finish.
+
+    With cprofilePath set, the stage named cprofileStage runs under cProfile;
+    without cprofileStage every stage is profiled and the slowest one is
+    dumped. Stages nested inside a profiled one are timed but not profiled.
+    """
+    enabled = True
+
+    def __init__(self, memory: bool = True, cprofilePath: Optional[str] = None,
+                 cprofileStage: Optional[str] = None):
+        self.memory = memory
+        self.cprofilePath = cprofilePath
+        self.cprofileStage = cprofileStage
+        self.records: List[stageRecord] = []
+        self._profiling = False
+        self._hottest: Optional[stageRecord] = None
+        self._started = time.perf_counter()
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stage(self, name: str, nbytes: int = 0) -> stageRecord:
+        return stageRecord(self, name, nbytes)
+
+    def wantsProfile(self, name: str) -> bool:
+        if not self.cprofilePath or self._profiling:
+            return False
+        return self.cprofileStage is None or self.cprofileStage == name
+
+    def _finish(self, record: stageRecord) -> None:
+        self.records.append(record)
+        if record._profile is not None:
+            if self._hottest is None or record.wall > self._hottest.wall:
+                self._hottest = record
+            else:
+                record._profile = None
+
+    def dumpProfile(self) -> Optional[str]:
+        """
+        Writes the cProfile stats of the profiled (or slowest) stage, returning
+        its name.
+        """
+        if self._hottest is None:
+            return None
+        self._hottest._profile.dump_stats(self.cprofilePath)
+        return self._hottest.name
+
+    def asDict(self) -> dict:
+        return {'total': time.perf_counter() - self._started, 'stages': [record.asDict() for record in self.records]}
+
+    def report(self, fmt: str = 'table', file: TextIO = None) -> None:
+        """
+        Writes the stages as JSON or as an aligned table (to stderr by default),
+        then the cProfile dump if one was requested.
+        """
+        file = file or sys.stderr
+        profiled = self.dumpProfile()
+
+        if fmt == 'json':
+            import json
+
+            data = self.asDict()
+            data['cprofile'] = {'stage': profiled, 'path': self.cprofilePath} if profiled else None
+            json.dump(data, file, indent=2)
+            print(file=file)
+            return
+
+        print(f"{'stage':<18} {'wall s':>9} {'cpu s':>9} {'MB':>10} {'MB/s':>10} {'peak MB':>10}", file=file)
+        for record in self.records:
+            megabytes = record.bytes / 1e6
+            rate = f"{megabytes / record.wall:10.2f}" if record.bytes and record.wall > 0 else f"{'-':>10}"
+            peak = f"{record.peak / 1e6:10.2f}" if record.peak is not None else f"{'-':>10}"
+            print(f"{record.name:<18} {record.wall:9.4f} {record.cpu:9.4f} {megabytes:10.2f} {rate} {peak}", file=file)
+        print(f"{'total':<18} {time.perf_counter() - self._started:9.4f}", file=file)
+        if profiled:
+            print(f"cProfile of stage '{profiled}' saved to '{self.cprofilePath}'.", file=file)
+
+
+PROFILER = nullProfiler()
+
+
+def getProfiler():
+    """
+    Returns the active profiler; instrumented code calls getProfiler().stage().
+    """
+    return PROFILER
+
+
+def setProfiler(profiler) -> None:
+    """
+    Installs a profiler for the whole process (None turns profiling off).
+    """
+    global PROFILER
+    PROFILER = nullProfiler() if profiler is None else profiler
@@ -0,0 +1,51 @@
+# streamCracker.py
+from caesarCracker import letterHistogram, rankShifts
+from typing import Dict, Iterable, List, Optional, TextIO, Tuple
+import math
+
+DEFAULT_MARGIN = 50.0
+DEFAULT_MIN_LETTERS = 100
+DEFAULT_CRACK_CHUNK_SIZE = 4096
+
+
+def crackStream(chunks: Iterable[str], alphabet: str = 'abcdefghijklmnopqrstuvwxyz',
+                reference: Optional[Dict[str, float]] = None, margin: float = DEFAULT_MARGIN,
+                minLetters: int = DEFAULT_MIN_LETTERS,
+                keep: Optional[TextIO] = None) -> Tuple[List[Tuple[int, float]], int, int, bool]:
+    """
+    Cracks a whole-text Caesar ciphertext from as little of the stream as
+    needed.
+
+    Letter counts are updated chunk by chunk and all shifts re-ranked by
+    negative log-likelihood after each one. Reading stops once at least
+    minLetters letters were seen and the best shift beats both the runner-up
+    and uniformly random letters by `margin` nats, i.e. odds of about
+    e**margin to 1. Text that is not English under any shift (random
+    letters) never gets past the second test.
+
+    Returns (ranked (shift, score) pairs, letters counted, characters read,
+    whether the margin was reached). Every chunk read is also written to
+    `keep` when given (e.g. a temporary file), so callers can replay the
+    text without holding it in memory. The rest of the iterator is left
+    unread.
+    """
+    histogram = [0] * len(alphabet)
+    letters = read = 0
+    uniform = math.log(len(alphabet))
+
+    for chunk in chunks:
+        if keep is not None:
+            keep.write(chunk)
+        read += len(chunk)
+        counts = letterHistogram(chunk.lower(), alphabet)
+        histogram = [total + count for total, count in zip(histogram, counts)]
+        letters += sum(counts)
+        if letters < max(minLetters, 1):
+            continue
+
+        ranked = rankShifts(histogram, alphabet, 'loglik', reference)
+        runnerUp = ranked[1][1] if len(ranked) > 1 else math.inf
+        if min(runnerUp, letters * uniform) - ranked[0][1] >= margin:
+            return ranked, letters, read, True
+
+    return rankShifts(histogram, alphabet, 'loglik', reference), letters, read, False
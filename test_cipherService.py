@@ -0,0 +1,50 @@
+# test_cipherService.py
+from cipherService import cipherService
+import asyncio
+import json
+import unittest
+
+
+class malformedJobTest(unittest.TestCase):
+    """
+    Every job line gets exactly one answer, even when the job is malformed.
+    """
+
+    def exchange(self, jobs):
+        async def run():
+            service = cipherService(workers=1)
+            server = await asyncio.start_server(service.handleConnection, '127.0.0.1', 0)
+            try:
+                port = server.sockets[0].getsockname()[1]
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                for job in jobs:
+                    writer.write(json.dumps(job).encode('utf-8') + b'\n')
+                await writer.drain()
+                answers = [json.loads(await asyncio.wait_for(reader.readline(), 30)) for _ in jobs]
+                writer.close()
+                return {answer['id']: answer for answer in answers}
+            finally:
+                server.close()
+                await server.wait_closed()
+                service.close()
+
+        return asyncio.run(run())
+
+    def test_malformed_jobs_are_answered(self):
+        answers = self.exchange([
+            {'id': 1, 'text': 5},
+            {'id': 2, 'text': 'hello world', 'keepNonAlpha': True},
+            {'id': 3, 'text': 5, 'wordCipher': True},
+            {'id': 4, 'text': 'abc', 'shift': 'x'},
+            {'id': 5, 'text': 'abc', 'bogus': True},
+        ])
+
+        self.assertEqual(sorted(answers), [1, 2, 3, 4, 5])
+        self.assertEqual(answers[2]['result'], 'khoor zruog')
+        for job_id in (1, 3, 4, 5):
+            self.assertIsNone(answers[job_id]['result'])
+            self.assertTrue(answers[job_id]['error'])
+
+
+if __name__ == "__main__":
+    unittest.main()
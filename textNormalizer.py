@@ -0,0 +1,150 @@
+# textNormalizer.py
+from caesarCipher import caesarCipher, getCompiledState
+from cipher import cipher
+from typing import Optional
+import re
+
+_WHITESPACE_RUN = re.compile(r'\s{2,}')
+_NON_ALPHA = re.compile(r'[^a-z\s]')
+
+# Placeholder bytes in the fused table: _DELETED marks characters removed by
+# the cleaning step (they must still separate whitespace runs until the runs
+# are collapsed), _OTHER_SPACE marks whitespace other than ' ', '\n' and '\r',
+# whose runs need the regex path.
+_DELETED = b'\x00'
+_OTHER_SPACE = b'\x01'
+
+
+class textNormalizer:
+    """
+    Input normalization compiled from the options.
+
+    The result always matches the chained str operations it replaces:
+    strip(), lower() when `lowercase` is set, '\\n'/'\\r' to spaces plus
+    collapsing whitespace runs when `collapseWhitespace` is set, and removing
+    everything but a-z and whitespace unless `keepNonAlpha` is set.
+
+    For ASCII input the whole chain runs as one 256-entry byte translate plus
+    a replace loop, and transform() folds the cipher mapping into that same
+    table.
+    """
+
+    def __init__(self, keepNonAlpha: bool = False, collapseWhitespace: bool = True, lowercase: bool = True):
+        self.keepNonAlpha = keepNonAlpha
+        self.collapseWhitespace = collapseWhitespace
+        self.lowercase = lowercase
+        self._tables = {}
+
+    def normalize(self, text: str) -> str:
+        """
+        Returns the normalized text.
+        """
+        result = self._fused(text, self._table(None))
+        return self._chain(text) if result is None else result
+
+    def transform(self, cipher_obj: cipher, text: str, decrypt: bool = False) -> str:
+        """
+        Same result as cipher_obj.encrypt(normalize(text)) (or decrypt), in
+        a single pass over ASCII input.
+        """
+        table = self._cipherTable(cipher_obj, decrypt)
+        result = self._fused(text, table) if table else None
+        if result is None:
+            text = self.normalize(text)
+            return cipher_obj.decrypt(text) if decrypt else cipher_obj.encrypt(text)
+
+        # Characters outside the alphabet map to themselves, so checking the
+        # output reports the same character transform() would; the extra
+        # strip is encrypt()'s own.
+        result = result.strip()
+        cipher_obj._checkAlphabet(result)
+        return result
+
+    def _chain(self, text: str) -> str:
+        text = text.strip()
+        if self.lowercase:
+            text = text.lower()
+        if self.collapseWhitespace:
+            text = text.replace('\n', ' ').replace('\r', ' ')
+            text = _WHITESPACE_RUN.sub(' ', text)
+        if not self.keepNonAlpha:
+            text = _NON_ALPHA.sub('', text)
+        return text
+
+    def _fused(self, text: str, table: Optional[bytes]) -> Optional[str]:
+        """
+        Runs the byte-level pipeline, or returns None when the text needs the
+        str chain (non-ASCII input, or runs of other whitespace).
+        """
+        if not text.isascii():
+            return None
+
+        data = text.strip().encode('ascii').translate(table)
+        if self.collapseWhitespace:
+            if _OTHER_SPACE in data:
+                return None
+            while b'  ' in data:
+                data = data.replace(b'  ', b' ')
+        if not self.keepNonAlpha:
+            data = data.replace(_DELETED, b'')
+        return data.decode('ascii')
+
+    def _cipherTable(self, cipher_obj: cipher, decrypt: bool) -> Optional[bytes]:
+        """
+        Returns the fused table for a caesarCipher config, or None when the
+        byte path cannot reproduce encrypt(): non-ASCII alphabets, alphabets
+        containing whitespace (the final strip must not see mapped
+        characters) or the placeholder bytes, and normalizers that leave case
+        alone (encrypt() lowercases anyway).
+        """
+        if not isinstance(cipher_obj, caesarCipher) or not self.lowercase:
+            return None
+
+        conf = cipher_obj.getConfig()
+        alphabet = conf['alphabet']
+        if not alphabet.isascii() or any(ch.isspace() or ch in '\x00\x01' for ch in alphabet):
+            return None
+
+        key = (alphabet, conf['shift'], decrypt)
+        table = self._tables.get(key)
+        if table is None:
+            state = getCompiledState(alphabet, conf['shift'], conf['preserve_nonalpha'])
+            table = self._table(state.decTable if decrypt else state.encTable)
+            self._tables[key] = table
+        return table
+
+    def _table(self, mapping: Optional[dict]) -> bytes:
+        if mapping is None and None in self._tables:
+            return self._tables[None]
+
+        table = bytearray(range(256))
+        for b in range(128):
+            ch = chr(b)
+            if ch.isspace():
+                if self.collapseWhitespace:
+                    table[b] = ord(' ') if ch in '\n\r ' else _OTHER_SPACE[0]
+                continue
+
+            if self.lowercase:
+                ch = ch.lower()
+            if not self.keepNonAlpha and not 'a' <= ch <= 'z':
+                table[b] = _DELETED[0]
+            elif mapping:
+                table[b] = ord(ch.translate(mapping))
+            else:
+                table[b] = ord(ch)
+
+        if mapping is None:
+            self._tables[None] = bytes(table)
+        return bytes(table)
+
+
+CLEAN_TEXT = textNormalizer(keepNonAlpha=False)
+KEEP_NON_ALPHA = textNormalizer(keepNonAlpha=True, collapseWhitespace=False)
+
+
+def getNormalizer(keepNonAlpha: bool) -> textNormalizer:
+    """
+    Returns the normalizer the entry scripts use for the --keepNonAlpha flag.
+    """
+    return KEEP_NON_ALPHA if keepNonAlpha else CLEAN_TEXT
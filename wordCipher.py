@@ -0,0 +1,395 @@
+# wordCipher.py
+from caesarCipher import caesarCipher, getCompiledState
+from cipherStream import DEFAULT_CHUNK_SIZE, normalizeSegments, readChunks, segmentAtWhitespace, stripStream
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, TextIO
+import random
+import re
+import string
+
+WORD_SHIFT_MODES = ('same', 'random', 'sequence', 'counter')
+
+_MASK64 = (1 << 64) - 1
+_GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+
+TOKEN_PATTERN = re.compile(r"[A-Za-z]+|[^A-Za-z]+")
+WORD_SPLIT_PATTERN = re.compile(r"([A-Za-z]+)")
+WORD_END_PATTERN = re.compile(r"[A-Za-z](?![A-Za-z])")
+
+
+def wordShiftSchedule(word_count: int, alphabet_size: int, word_shift_mode: str, word_shift: int,
+                      shift_sequence: Optional[List[int]], seed: int, first_word: int = 0) -> List[int]:
+    """
+    Computes the shift of every word up front.
+
+    Matches the shifts the per-word loop used to draw: 'random' takes one
+    random.Random(seed).randint(1, alphabet_size - 1) per word. first_word is
+    the 0-based index of the first word, for text cut out of a larger one.
+    """
+    if word_count == 0:
+        return []
+
+    if word_shift_mode == 'same':
+        return [word_shift] * word_count
+    if word_shift_mode == 'random':
+        _checkRandomOffset(first_word)
+        return randomShifts(seed, word_count, alphabet_size)
+    if word_shift_mode == 'sequence':
+        if not shift_sequence:
+            raise ValueError("wordShiftMode=sequence requires --shiftSequence.")
+        start = first_word % len(shift_sequence)
+        repeats = -(-(start + word_count) // len(shift_sequence))
+        return (list(shift_sequence) * repeats)[start:start + word_count]
+    if word_shift_mode == 'counter':
+        return [counterShift(seed, index, alphabet_size) for index in range(first_word, first_word + word_count)]
+
+    raise ValueError(f"Unknown wordShiftMode: {word_shift_mode}")
+
+
+def iterWordShifts(alphabet_size: int, word_shift_mode: str, word_shift: int,
+                   shift_sequence: Optional[List[int]], seed: int, first_word: int = 0) -> Iterator[int]:
+    """
+    Yields the shift of word #1, #2, ... without a known word count.
+
+    Like the original loop, an invalid mode or missing sequence only raises
+    once the first word asks for a shift.
+    """
+    if word_shift_mode == 'same':
+        while True:
+            yield word_shift
+    elif word_shift_mode == 'random':
+        _checkRandomOffset(first_word)
+        yield from iterRandomShifts(seed, alphabet_size)
+    elif word_shift_mode == 'sequence':
+        if not shift_sequence:
+            raise ValueError("wordShiftMode=sequence requires --shiftSequence.")
+        yield from shift_sequence[first_word % len(shift_sequence):]
+        while True:
+            yield from shift_sequence
+    elif word_shift_mode == 'counter':
+        index = first_word
+        while True:
+            yield counterShift(seed, index, alphabet_size)
+            index += 1
+    else:
+        raise ValueError(f"Unknown wordShiftMode: {word_shift_mode}")
+
+
+def counterShift(seed: int, index: int, alphabet_size: int) -> int:
+    """
+    Returns the shift of the word at 0-based index in 'counter' mode.
+
+    The shift is the index-th SplitMix64 output for the seed, reduced to
+    1..alphabet_size-1, so any word's shift is computed in O(1) without
+    replaying the words before it.
+    """
+    z = (seed + (index + 1) * _GOLDEN_GAMMA) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    z ^= z >> 31
+    return 1 + z % (alphabet_size - 1)
+
+
+def _checkRandomOffset(first_word: int) -> None:
+    if first_word:
+        raise ValueError("wordShiftMode=random cannot start mid-text; use wordShiftMode=counter.")
+
+
+def randomShifts(seed: int, count: int, alphabet_size: int) -> List[int]:
+    """
+    Returns the first `count` values of random.Random(seed).randint(1, alphabet_size - 1).
+    """
+    return list(islice(iterRandomShifts(seed, alphabet_size), count))
+
+
+def iterRandomShifts(seed: int, alphabet_size: int, block: int = 4096) -> Iterator[int]:
+    """
+    Yields random.Random(seed).randint(1, alphabet_size - 1) values in bulk.
+
+    randint(1, w) draws getrandbits(k) with k = w.bit_length() and rejects
+    values >= w; each getrandbits(k) call keeps the top k bits of one 32-bit
+    Mersenne Twister output. A single getrandbits(32 * m) returns m outputs,
+    least significant first, so the top byte of every 4-byte group yields the
+    same draws in bulk. Widths where that does not apply use randint directly.
+    """
+    width = alphabet_size - 1
+    bits = width.bit_length()
+    rng = random.Random(seed)
+
+    if width < 3 or bits > 8 or width & (width - 1) == 0:
+        while True:
+            yield rng.randint(1, width)
+
+    drop = 8 - bits
+    table = bytes(((b >> drop) + 1) & 0xff for b in range(256))
+    rejected = bytes(b for b in range(256) if (b >> drop) >= width)
+
+    while True:
+        data = rng.getrandbits(32 * block).to_bytes(4 * block, 'little')
+        yield from data[3::4].translate(table, rejected)
+
+
+def shiftTables(alphabet: str, decrypt: bool) -> List[dict]:
+    """
+    Returns one translation table per shift 0..len(alphabet)-1, taken from
+    the shared compiled-state cache.
+    """
+    states = [getCompiledState(alphabet, shift) for shift in range(len(alphabet))]
+    return [state.decTable if decrypt else state.encTable for state in states]
+
+
+def logHeader(word_shift_mode: str, word_shift: int, shift_sequence, seed: int) -> List[str]:
+    """
+    Returns the header lines of the per-word shift log.
+    """
+    lines = []
+    if word_shift_mode == "same":
+        lines.append(f"[wordShiftMode=same] shift={word_shift}")
+    elif word_shift_mode == "random":
+        lines.append(f"[wordShiftMode=random] seed={seed} (shift chosen per word)")
+    elif word_shift_mode == "sequence":
+        lines.append(f"[wordShiftMode=sequence] sequence={shift_sequence}")
+    elif word_shift_mode == "counter":
+        lines.append(f"[wordShiftMode=counter] seed={seed} (shift derived from seed and word index)")
+    lines.append("")
+    return lines
+
+
+def iterTokens(chunks: Iterable[str], limit: int = 4 * DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Streaming tokenizer: yields the same tokens as TOKEN_PATTERN.findall on
+    the concatenated chunks.
+
+    The last token of every chunk may continue in the next one, so it is
+    carried over instead of being yielded. A non-letter token longer than
+    `limit` is yielded in pieces that each contain a non-alphabetic
+    character, so none of them is mistaken for a word.
+    """
+    carry = ''
+    for chunk in chunks:
+        last = None
+        for match in TOKEN_PATTERN.finditer(carry + chunk):
+            if last is not None:
+                yield last
+            last = match.group()
+        carry = last or ''
+
+        if len(carry) >= limit and carry[0] not in string.ascii_letters:
+            cut = len(carry) - 1
+            while cut > 0 and carry[cut].isalpha():
+                cut -= 1
+            if cut and not carry[:cut].isalpha():
+                yield carry[:cut]
+                carry = carry[cut:]
+
+    if carry:
+        yield carry
+
+
+def transformTokens(tokens: Iterable[str], alphabet: str, decrypt: bool, word_shift_mode: str, word_shift: int,
+                    shift_sequence, seed: int, log: Optional[Callable[[str], None]] = None,
+                    first_word: int = 0) -> Iterator[str]:
+    """
+    Yields every token with words encrypted/decrypted by their own shift.
+
+    When log is given it receives the log header and one line per word as
+    soon as that word is transformed.
+    """
+    size = len(alphabet)
+    tables = shiftTables(alphabet, decrypt)
+    shifts = iterWordShifts(size, word_shift_mode, word_shift, shift_sequence, seed, first_word)
+
+    if log is not None:
+        for line in logHeader(word_shift_mode, word_shift, shift_sequence, seed):
+            log(line)
+
+    word_idx = first_word
+    for tok in tokens:
+        if tok.isalpha():
+            shift = next(shifts)
+            word_idx += 1
+
+            original_word = tok.lower()
+            transformed_word = original_word.translate(tables[shift % size])
+            if log is not None:
+                log(f'word #{word_idx}: "{original_word}" | shift={shift} | result="{transformed_word}"')
+            yield transformed_word
+        else:
+            yield tok
+
+
+def splitWords(text: str) -> List[str]:
+    """
+    Splits text like re.split with a capturing group: words at odd indices,
+    the text between them (possibly empty) at even ones.
+
+    Words are exactly the tokens the word cipher shifts, i.e. the
+    TOKEN_PATTERN tokens that are str.isalpha().
+    """
+    if text.isascii():
+        return WORD_SPLIT_PATTERN.split(text)
+
+    parts = ['']
+    for tok in TOKEN_PATTERN.findall(text):
+        if tok.isalpha():
+            parts += [tok, '']
+        else:
+            parts[-1] += tok
+    return parts
+
+
+def applyWordCipher(raw_text: str, alphabet: str, decrypt: bool, word_shift_mode: str, word_shift: int,
+                    shift_sequence, seed: int, log: Optional[Callable[[str], None]] = None,
+                    first_word: int = 0) -> str:
+    """
+    Encrypts/decrypts every word with its own shift.
+
+    Without a log the shift schedule is computed first and words are
+    translated with precompiled per-shift tables in bulk; with a log the
+    streaming transformTokens path hands each line to log as it goes. The
+    alphabet is expected to be validated already.
+    """
+    if log is not None:
+        tokens = (match.group() for match in TOKEN_PATTERN.finditer(raw_text))
+        return "".join(transformTokens(tokens, alphabet, decrypt, word_shift_mode, word_shift,
+                                       shift_sequence, seed, log=log, first_word=first_word))
+
+    size = len(alphabet)
+    tables = shiftTables(alphabet, decrypt)
+
+    # 'same' is one translate over the whole text: ASCII text only has
+    # letters inside word tokens, and lowercasing leaves the rest as is.
+    if (word_shift_mode == 'same' and raw_text.isascii()
+            and set(alphabet) <= set(string.ascii_lowercase)):
+        return raw_text.lower().translate(tables[word_shift % size])
+
+    if raw_text.isascii():
+        return _applyAsciiWords(raw_text, alphabet, tables, word_shift_mode, word_shift,
+                                shift_sequence, seed, first_word)
+
+    tokens = TOKEN_PATTERN.findall(raw_text)
+    shifts = wordShiftSchedule(sum(1 for tok in tokens if tok.isalpha()), size,
+                               word_shift_mode, word_shift, shift_sequence, seed, first_word)
+
+    word_tables = iter([tables[shift % size] for shift in shifts])
+    return "".join([tok.lower().translate(next(word_tables)) if tok.isalpha() else tok for tok in tokens])
+
+
+def streamWordCipher(source: TextIO, sink: TextIO, alphabet: str, decrypt: bool, word_shift_mode: str,
+                     word_shift: int, shift_sequence, seed: int, keepNonAlpha: bool = True,
+                     chunkSize: int = DEFAULT_CHUNK_SIZE, log: Optional[Callable[[str], None]] = None) -> int:
+    """
+    Word cipher over a text stream with bounded memory.
+
+    Chunks are normalized like the word-by-word path of caesarCipherMain2.py
+    (strip, then lowercase or clean), tokenized with finditer and written to
+    sink as they are transformed. Returns the number of characters written.
+    """
+    segments = stripStream(segmentAtWhitespace(readChunks(source, chunkSize), limit=4 * chunkSize), limit=4 * chunkSize)
+    tokens = iterTokens(normalizeSegments(segments, keepNonAlpha), limit=4 * chunkSize)
+
+    written = 0
+    for out in transformTokens(tokens, alphabet, decrypt, word_shift_mode, word_shift,
+                               shift_sequence, seed, log=log):
+        sink.write(out)
+        written += len(out)
+    sink.flush()
+    return written
+
+
+def _applyAsciiWords(raw_text: str, alphabet: str, tables: List[dict], word_shift_mode: str, word_shift: int,
+                     shift_sequence, seed: int, first_word: int = 0) -> str:
+    """
+    Word cipher for ASCII text without a log.
+
+    Splitting on letter runs puts every word at an odd index. In sequence mode
+    all words of one residue class share a shift, so each class is joined,
+    translated and split back in one go.
+    """
+    size = len(alphabet)
+    parts = WORD_SPLIT_PATTERN.split(raw_text)
+    words = parts[1::2]
+    shifts = wordShiftSchedule(len(words), size, word_shift_mode, word_shift, shift_sequence, seed, first_word)
+
+    period = len(shift_sequence) if word_shift_mode == 'sequence' and shift_sequence else 0
+    if period and '\0' not in alphabet:
+        for residue in range(min(period, len(words))):
+            group = slice(1 + 2 * residue, None, 2 * period)
+            joined = '\0'.join(parts[group]).lower()
+            parts[group] = joined.translate(tables[shifts[residue] % size]).split('\0')
+    else:
+        parts[1::2] = [word.lower().translate(tables[shift % size]) for word, shift in zip(words, shifts)]
+
+    return "".join(parts)
+
+
+def validateAlphabet(cipher_obj: caesarCipher, alphabet: str) -> None:
+    """
+    Runs the usual config validation once instead of once per word.
+    """
+    cipher_obj.setConfig({
+        'shift': 0,
+        'alphabet': alphabet,
+        'preserve_nonalpha': True
+    })
+
+
+def countWords(text: str) -> int:
+    """
+    Counts the tokens the word cipher treats as words.
+    """
+    if text.isascii():
+        return len(WORD_SPLIT_PATTERN.findall(text))
+    return sum(1 for match in TOKEN_PATTERN.finditer(text) if match.group().isalpha())
+
+
+def splitAtWordBoundaries(text: str, chunkSize: int) -> List[str]:
+    """
+    Cuts text into pieces of roughly chunkSize characters.
+
+    Every cut falls right after an ASCII letter that is followed by a
+    non-letter, i.e. between a word token and the next token, so the pieces
+    tokenize exactly like the whole text.
+    """
+    pieces = []
+    start = 0
+    while len(text) - start > chunkSize:
+        match = WORD_END_PATTERN.search(text, start + chunkSize)
+        if not match:
+            break
+        pieces.append(text[start:match.end()])
+        start = match.end()
+    pieces.append(text[start:])
+    return pieces
+
+
+def _applyWordChunk(args) -> str:
+    raw_text, alphabet, decrypt, word_shift_mode, word_shift, shift_sequence, seed, first_word = args
+    return applyWordCipher(raw_text, alphabet, decrypt, word_shift_mode, word_shift,
+                           shift_sequence, seed, first_word=first_word)
+
+
+def parallelWordCipher(raw_text: str, alphabet: str, decrypt: bool, word_shift_mode: str, word_shift: int,
+                       shift_sequence, seed: int, workers: int = 1, chunkSize: int = DEFAULT_CHUNK_SIZE) -> str:
+    """
+    Chunk-parallel word cipher for large texts.
+
+    Each chunk gets the index of its first word from a counting pass, so
+    modes whose shifts can be derived from the word index ('same',
+    'sequence', 'counter') run on a process pool. 'random' has to replay one
+    RNG stream and always runs serially.
+    """
+    if workers <= 1 or word_shift_mode == 'random' or len(raw_text) <= chunkSize:
+        return applyWordCipher(raw_text, alphabet, decrypt, word_shift_mode, word_shift, shift_sequence, seed)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    pieces = splitAtWordBoundaries(raw_text, chunkSize)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        offsets = [0]
+        for count in pool.map(countWords, pieces):
+            offsets.append(offsets[-1] + count)
+
+        jobs = [(piece, alphabet, decrypt, word_shift_mode, word_shift, shift_sequence, seed, first_word)
+                for piece, first_word in zip(pieces, offsets)]
+        return "".join(pool.map(_applyWordChunk, jobs))
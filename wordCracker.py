@@ -0,0 +1,223 @@
+# wordCracker.py
+from caesarCipher import getCompiledState
+from caesarCracker import ENGLISH_FREQUENCIES, referenceDistribution
+from wordCipher import splitWords
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+import math
+import os
+
+# Frequent English words, enough to anchor most shifts without a --dictionary file.
+COMMON_WORDS = """
+a about above across after again against all almost alone along already also although always am among an and
+another any anyone anything are area around as ask asked at away back be became because become been before began
+behind being best better between big black body book both boy but by called came can case change children city
+close come could country course day days did different do does done door down during each early end enough even
+ever every eyes face fact family far father feel felt few find first five for form found four friend from front
+full gave get give given go going good got great group had hand hands has have he head hear heard help her here
+high him himself his home house how however i if important in into is it its itself just keep kind knew know
+known land large last later least left less let life light like line little live long look looked made make man
+many may me mean men might mind more morning most mother much must my name near need never new next night no not
+nothing now number of off often old on once one only open or order other others our out over own part people
+perhaps place point power present problem public put quite rather read real really right room said same saw say
+school second see seemed seen set several shall she should show side since small so social some something sometimes
+soon state still story such sure system take taken than that the their them then there these they thing things
+think this those though thought three through time to today together told too took toward turn two under until
+up upon us use used very want war was water way we well went were what when where whether which while white who
+whole why will with within without woman women word words work world would year years yes yet you young your
+""".split()
+
+# Neighbouring word pairs that are common enough to break ties between
+# candidate decryptions.
+COMMON_BIGRAMS = frozenset(tuple(pair.split()) for pair in """
+of the|in the|to the|on the|and the|for the|to be|at the|from the|by the|with the|it is|that the|in a|is a|of a|
+it was|there is|there was|i am|i was|he was|she was|we are|they are|you are|has been|have been|will be|as a|
+is the|was the|this is|one of|out of|all the|do not|can be|it has|we have|i have|to a|into the|over the
+""".replace('\n', '').split('|') if pair.strip())
+
+DEFAULT_TOP_CANDIDATES = 6
+MIN_PARALLEL_WORDS = 50_000
+
+# Score weights: dictionary hits dominate the letter-frequency fallback,
+# and the transition bonuses only break near-ties.
+_DICT_BONUS = 2.0
+_DICT_BONUS_PER_LETTER = 2.5
+_SAME_SHIFT_BONUS = 1.5
+_BIGRAM_BONUS = 2.0
+_UNKNOWN_LETTER = -20.0
+
+_workerDictionary: FrozenSet[str] = frozenset()
+
+
+def loadDictionary(path: Optional[str] = None) -> FrozenSet[str]:
+    """
+    Returns the built-in word set, extended with one word per line from path.
+    """
+    words = set(COMMON_WORDS)
+    if path:
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"File not found: {path}")
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            words.update(line.strip().lower() for line in f if line.strip().isalpha())
+    return frozenset(words)
+
+
+def bigramModel(dictionary: FrozenSet[str], alphabet: str) -> Dict[str, float]:
+    """
+    Letter-bigram log-probabilities (with '^'/'$' word boundaries) learned
+    from the dictionary, add-one smoothed. Scores words the dictionary does
+    not contain.
+    """
+    symbols = '^' + alphabet + '$'
+    counts = {a + b: 1 for a in symbols[:-1] for b in symbols[1:]}
+    for word in dictionary:
+        padded = '^' + word + '$'
+        for i in range(len(padded) - 1):
+            pair = padded[i:i + 2]
+            if pair in counts:
+                counts[pair] += 1
+
+    totals = {}
+    for pair, count in counts.items():
+        totals[pair[0]] = totals.get(pair[0], 0) + count
+    return {pair: math.log(count / totals[pair[0]]) for pair, count in counts.items()}
+
+
+def scoreWordShifts(words: List[str], alphabet: str, dictionary: FrozenSet[str],
+                    topK: int = DEFAULT_TOP_CANDIDATES,
+                    model: Optional[Dict[str, float]] = None) -> Dict[str, List[Tuple[int, float, str]]]:
+    """
+    Scores all shifts of every distinct word and keeps the topK.
+
+    The distinct words are joined and decrypted with one translate per
+    shift; each decryption scores its letter-bigram log-probability plus a
+    bonus when it is a dictionary word. Returns word -> [(shift, score,
+    plaintext)], best first; higher is better.
+    """
+    unique = list(dict.fromkeys(words))
+    if not unique:
+        return {}
+
+    model = bigramModel(dictionary, alphabet) if model is None else model
+    unknown = min(model.values())
+    size = len(alphabet)
+    logp = [math.log(p) for p in referenceDistribution(alphabet, ENGLISH_FREQUENCIES)]
+    joined = '\0'.join(unique)
+    encoded = [word.encode('utf-8') for word in unique]
+    scored = [[] for _ in unique]
+
+    for shift in range(size):
+        plains = joined.translate(getCompiledState(alphabet, shift).decTable).split('\0')
+
+        # byte of a ciphertext letter -> English log-frequency of its plaintext letter
+        letters = [_UNKNOWN_LETTER] * 256
+        for i, ch in enumerate(alphabet):
+            if ord(ch) < 256:
+                letters[ord(ch)] = logp[(i - shift) % size]
+
+        for i, plain in enumerate(plains):
+            padded = '^' + plain + '$'
+            score = sum(model.get(padded[j:j + 2], unknown) for j in range(len(padded) - 1)) \
+                + sum(map(letters.__getitem__, encoded[i]))
+            if plain in dictionary:
+                score += _DICT_BONUS + _DICT_BONUS_PER_LETTER * len(plain)
+            scored[i].append((shift, score, plain))
+
+    return {word: sorted(candidates, key=lambda item: -item[1])[:topK]
+            for word, candidates in zip(unique, scored)}
+
+
+def viterbiShifts(words: List[str], candidates: Dict[str, List[Tuple[int, float, str]]]) -> List[Tuple[int, str]]:
+    """
+    Picks one candidate per word, maximizing word scores plus bonuses for
+    neighbours that share a shift or form a common bigram.
+
+    Returns (shift, plaintext) per word.
+    """
+    if not words:
+        return []
+
+    previous = candidates[words[0]]
+    best = [score for _, score, _ in previous]
+    back = []
+
+    for word in words[1:]:
+        current = candidates[word]
+        scores, pointers = [], []
+        for shift, score, plain in current:
+            top, arg = -math.inf, 0
+            for j, (prev_shift, _, prev_plain) in enumerate(previous):
+                total = best[j]
+                if prev_shift == shift:
+                    total += _SAME_SHIFT_BONUS
+                if (prev_plain, plain) in COMMON_BIGRAMS:
+                    total += _BIGRAM_BONUS
+                if total > top:
+                    top, arg = total, j
+            scores.append(top + score)
+            pointers.append(arg)
+        back.append(pointers)
+        previous, best = current, scores
+
+    index = max(range(len(best)), key=best.__getitem__)
+    path = [index]
+    for pointers in reversed(back):
+        index = pointers[index]
+        path.append(index)
+    path.reverse()
+
+    recovered = []
+    for word, i in zip(words, path):
+        shift, _, plain = candidates[word][i]
+        recovered.append((shift, plain))
+    return recovered
+
+
+def _initWorker(dictionary: FrozenSet[str]) -> None:
+    global _workerDictionary
+    _workerDictionary = dictionary
+
+
+def _crackPiece(args) -> List[Tuple[int, str]]:
+    words, alphabet, dictionary = args
+    dictionary = _workerDictionary if dictionary is None else dictionary
+    return viterbiShifts(words, scoreWordShifts(words, alphabet, dictionary))
+
+
+def crackWordShifts(text: str, alphabet: str = 'abcdefghijklmnopqrstuvwxyz',
+                    dictionary: Optional[FrozenSet[str]] = None, workers: int = 1,
+                    pieceWords: int = MIN_PARALLEL_WORDS) -> Tuple[str, List[int], List[str]]:
+    """
+    Recovers the per-word shifts of word-cipher ciphertext with unknown
+    shifts (any wordShiftMode).
+
+    Long texts are cut into pieces of pieceWords words that are cracked on a
+    process pool; context only crosses a cut through the candidates' own
+    scores. Returns (plaintext, shifts, ciphertext words).
+    """
+    dictionary = loadDictionary() if dictionary is None else dictionary
+    parts = splitWords(text)
+    words = [word.lower() for word in parts[1::2]]
+
+    if workers <= 1 or len(words) <= pieceWords:
+        recovered = _crackPiece((words, alphabet, dictionary))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        pieces = [(words[i:i + pieceWords], alphabet, None) for i in range(0, len(words), pieceWords)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_initWorker, initargs=(dictionary,)) as pool:
+            recovered = [item for piece in pool.map(_crackPiece, pieces) for item in piece]
+
+    parts[1::2] = [plain for _, plain in recovered]
+    return "".join(parts), [shift for shift, _ in recovered], words
+
+
+def shiftLogLines(plaintext: str, shifts: List[int], cipher_words: List[str]) -> Iterator[str]:
+    """
+    Yields the recovered schedule in the word_shifts.txt format, as if the
+    plaintext had been encrypted word by word.
+    """
+    yield "[wordShiftMode=recovered] (shift found per word by dictionary cracking)"
+    yield ""
+    plain_words = splitWords(plaintext)[1::2]
+    for word_idx, (plain, shift, word) in enumerate(zip(plain_words, shifts, cipher_words), start=1):
+        yield f'word #{word_idx}: "{plain}" | shift={shift} | result="{word}"'